@@ -11,18 +11,42 @@ from app.controllers.user_controller import user_bp
 from app.controllers.steam_controller import steam_controller
 from app.controllers.cart_controller import cart_controller
 from app.error_handlers import register_error_handlers
+from app.utils.cache import init_cache
+from app.utils.response_cache import init_response_cache
+from app.utils.role_cache import init_role_cache
+from app.utils.identity import init_identity
+from app.utils.compression import init_compression
+from app.utils.conditional import init_conditional_get
+from app.utils.http_client import init_http_client
+from app.utils.async_http_client import init_async_http_client
+from app.utils.rate_limiter import init_rate_limiter
+from app.services.catalog_warmer import init_catalog_warmer
+from app.services.suggest_service import init_suggest_index
 
-def create_app(env: str | None = None) -> Flask:
+def create_app(env: str | None = None, overrides: dict | None = None) -> Flask:
     app = Flask(__name__)
     app.config.from_object(get_config(env))
+    if overrides:
+        app.config.update(overrides)
 
     db.init_app(app)
     migrate.init_app(app, db)
     cors.init_app(app)
     jwt.init_app(app)
+    init_identity(app)
     init_admin(app)
+    init_cache(app)
+    init_response_cache(app)
+    init_role_cache(app)
+    init_http_client(app)
+    init_async_http_client(app)
+    init_rate_limiter(app)
+    init_catalog_warmer(app)
+    init_suggest_index(app)
     
     register_error_handlers(app)
+    init_compression(app)
+    init_conditional_get(app)
 
     app.register_blueprint(admin_bp, url_prefix="/api/admins")
     app.register_blueprint(library_bp, url_prefix="/api")
@@ -13,7 +13,49 @@ class BaseConfig:
     SECRET_KEY = getenv("SECRET_KEY")
     JWT_SECRET_KEY = getenv("JWT_SECRET_KEY", getenv("SECRET_KEY"))
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # Seconds a user's admin/active flags are trusted from the per-process cache or a token's claims before re-reading `users`
+    ROLE_CACHE_TTL = int(getenv("ROLE_CACHE_TTL", 60))
+    ROLE_CACHE_MAX_ENTRIES = int(getenv("ROLE_CACHE_MAX_ENTRIES", 10000))
+    # Responses smaller than this are sent uncompressed; compressed copies of unchanged bodies are kept up to the byte cap
+    COMPRESS_MIN_SIZE = int(getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_CACHE_MAX_BYTES = int(getenv("COMPRESS_CACHE_MAX_BYTES", 16 * 1024 * 1024))
     STEAM_API_KEY = getenv("STEAM_API_KEY")
+    # Upstream roots; point both at a local stub to benchmark without touching Steam
+    STEAM_API_URL = getenv("STEAM_API_URL", "https://api.steampowered.com")
+    STEAM_STORE_URL = getenv("STEAM_STORE_URL", "https://store.steampowered.com/api")
+    STEAM_MAX_WORKERS = int(getenv("STEAM_MAX_WORKERS", 8))
+    STEAM_PRICE_BATCH_SIZE = int(getenv("STEAM_PRICE_BATCH_SIZE", 100))  # App IDs per price_overview lookup
+    # Token-bucket budgets in requests per second for api.steampowered.com and store.steampowered.com
+    STEAM_API_RATE_LIMIT = float(getenv("STEAM_API_RATE_LIMIT", 10))
+    STEAM_API_RATE_BURST = int(getenv("STEAM_API_RATE_BURST", 20))
+    STEAM_STORE_RATE_LIMIT = float(getenv("STEAM_STORE_RATE_LIMIT", 4))
+    STEAM_STORE_RATE_BURST = int(getenv("STEAM_STORE_RATE_BURST", 8))
+    STEAM_RATE_LIMIT_MAX_WAIT = float(getenv("STEAM_RATE_LIMIT_MAX_WAIT", 10))  # Requests that would queue longer are rejected
+    STEAM_RATE_LIMIT_BACKEND = getenv("STEAM_RATE_LIMIT_BACKEND", "sqlite")  # "sqlite" shares budgets across workers, "local" is per process
+    STEAM_RATE_LIMIT_PATH = getenv("STEAM_RATE_LIMIT_PATH")  # Defaults to <instance>/steam_rate_limit.sqlite3
+    STEAM_HTTP_CONNECT_TIMEOUT = float(getenv("STEAM_HTTP_CONNECT_TIMEOUT", 3.05))
+    STEAM_HTTP_READ_TIMEOUT = float(getenv("STEAM_HTTP_READ_TIMEOUT", 10))
+    STEAM_HTTP_RETRIES = int(getenv("STEAM_HTTP_RETRIES", 3))  # Retries on connection errors and 5xx, and of 429s through the rate limiter
+    STEAM_HTTP_BACKOFF = float(getenv("STEAM_HTTP_BACKOFF", 0.3))
+    STEAM_HTTP_POOL_SIZE = int(getenv("STEAM_HTTP_POOL_SIZE", 16))  # Max keep-alive connections per host
+    STEAM_ASYNC_MAX_CONNECTIONS = int(getenv("STEAM_ASYNC_MAX_CONNECTIONS", 100))  # Concurrent upstream calls across async views
+    STEAM_CACHE_BACKEND = getenv("STEAM_CACHE_BACKEND", "sqlite")  # "sqlite" is shared by all workers, "memory" is per process
+    STEAM_CACHE_PATH = getenv("STEAM_CACHE_PATH")  # Defaults to <instance>/steam_cache.sqlite3
+    STEAM_CACHE_MAX_ENTRIES = int(getenv("STEAM_CACHE_MAX_ENTRIES", 5000))
+    STEAM_CACHE_MAX_BYTES = int(getenv("STEAM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    STEAM_CACHE_TTL = int(getenv("STEAM_CACHE_TTL", 3600))  # Hard TTL: entries older than this block on a refetch
+    STEAM_CACHE_SOFT_TTL = int(getenv("STEAM_CACHE_SOFT_TTL", 600))  # Soft TTL: older entries are served while refreshing
+    # Per-process cache of encoded listing and detail responses, reused until the cached records change
+    STEAM_RESPONSE_CACHE_MAX_ENTRIES = int(getenv("STEAM_RESPONSE_CACHE_MAX_ENTRIES", 500))
+    STEAM_RESPONSE_CACHE_MAX_BYTES = int(getenv("STEAM_RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    STEAM_CATALOG_TTL = int(getenv("STEAM_CATALOG_TTL", 3600))  # Age after which a `games` row is refetched from Steam
+    # Searches answered by fewer catalog matches than this (or the limit, if lower) go to Steam's storesearch
+    STEAM_SEARCH_MIN_LOCAL_HITS = int(getenv("STEAM_SEARCH_MIN_LOCAL_HITS", 5))
+    STEAM_SUGGEST_SYNC_INTERVAL = int(getenv("STEAM_SUGGEST_SYNC_INTERVAL", 30))  # Seconds between suggestion index top-ups from `games`
+    # Seconds between in-process catalog warmer runs; 0 disables the thread (use `flask steam warm --loop` instead)
+    STEAM_WARMER_INTERVAL = int(getenv("STEAM_WARMER_INTERVAL", 0))
+    STEAM_WARMER_TOP_GAMES = int(getenv("STEAM_WARMER_TOP_GAMES", 100))
+    STEAM_WARMER_LISTING_SIZE = int(getenv("STEAM_WARMER_LISTING_SIZE", 30))
 
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
@@ -21,6 +63,8 @@ class DevelopmentConfig(BaseConfig):
 class TestConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = "sqlite+pysqlite:///:memory:"
     TESTING = True
+    STEAM_CACHE_BACKEND = "memory"
+    STEAM_RATE_LIMIT_BACKEND = "local"
 
 class ProductionConfig(BaseConfig):
     DEBUG = False
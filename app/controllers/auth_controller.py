@@ -50,7 +50,8 @@ def register():
 
     try:
         user = AuthService.register(**data)
-        access_token = create_access_token(identity=str(user.id), additional_claims={"username": user.username})
+        access_token = create_access_token(
+            identity=str(user.id), additional_claims={"username": user.username, **AuthService.role_claims(user)})
         return jsonify({
             "message": "user successfully created",
             "user": user.serialize(),
@@ -78,6 +79,7 @@ def login():
     if not user.check_password(data.get("password")):
         return jsonify({"error": "password does not match"})
 
-    access_token = create_access_token(identity=str(user.id), additional_claims={"username": data.get("username")})
+    access_token = create_access_token(
+        identity=str(user.id), additional_claims={"username": data.get("username"), **AuthService.role_claims(user)})
 
     return jsonify({"user": user.serialize(), "token": access_token})
@@ -5,6 +5,8 @@ from app.extensions import db
 from sqlalchemy import select
 from app.services.library import LibraryService
 from app.services.admin import AdminService
+from app.utils.conditional import conditional_response, make_etag
+from app.utils.pagination import SORTS, encode_cursor, page_params
 import logging
 
 library_bp = Blueprint('library', __name__)
@@ -15,18 +17,34 @@ library_bp = Blueprint('library', __name__)
 def get_user_library(user_id):
     current_user_id = get_jwt_identity()
 
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
     if current_user_id != user_id and not AdminService.is_admin(current_user_id):
         return jsonify({"success": False, "message": "Access denied"}), 403
 
     try:
-        library_items = LibraryService.get_user_library(user_id)
-        games = LibraryService.format_library_response(library_items)
+        limit, sort, after = page_params(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
-        return jsonify({
-            "success": True,
-            "message": "User library retrieved successfully",
-            "data": games
-        }), 200
+    try:
+        descending = SORTS[sort]
+
+        def build():
+            library_items, next_key = LibraryService.get_user_library(user_id, limit, after, descending)
+            games = LibraryService.format_library_response(library_items)
+
+            return jsonify({
+                "success": True,
+                "message": "User library retrieved successfully",
+                "data": games,
+                "next_cursor": encode_cursor(sort, *next_key) if next_key else None
+            }), 200
+
+        # A repeat poll only reads the page's keys and game versions instead of loading and serializing it
+        version = LibraryService.get_user_library_page_version(user_id, limit, after, descending)
+        return conditional_response(make_etag("library", user_id, limit, sort, after, version), build)
 
     except Exception as e:
         current_app.logger.error(f"Error retrieving user library: {str(e)}")
@@ -38,6 +56,9 @@ def get_user_library(user_id):
 def get_library_game(user_id, game_id):
     current_user_id = get_jwt_identity()
 
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
     if current_user_id != user_id and not AdminService.is_admin(current_user_id):
         return jsonify({"success": False, "message": "Access denied"}), 403
 
@@ -67,6 +88,9 @@ def get_library_game(user_id, game_id):
 def remove_library_game(user_id, game_id):
     current_user_id = get_jwt_identity()
 
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
     if current_user_id != user_id and not AdminService.is_admin(current_user_id):
         return jsonify({"success": False, "message": "Access denied"}), 403
 
@@ -91,6 +115,9 @@ def remove_library_game(user_id, game_id):
 def add_to_library(user_id):
     current_user_id = get_jwt_identity()
 
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
     if current_user_id != user_id and not AdminService.is_admin(current_user_id):
         return jsonify({"success": False, "message": "Access denied"}), 403
 
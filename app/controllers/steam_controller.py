@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify, current_app, request
-from app.services.steam_service import SteamService
+from app.services.async_steam_service import AsyncSteamService
+from app.services.steam_service import SEARCH_RESULTS_LIMIT
+from app.services.suggest_service import SuggestService
+from app.utils.response_cache import EncodedResponse
 import logging
 import datetime
 import random
@@ -7,8 +10,33 @@ import random
 logger = logging.getLogger(__name__)
 steam_controller = Blueprint('steam', __name__, url_prefix='/api/steam')
 
+async def _encoded_response(steam_service, key, app_ids, load):
+    """Pre-encoded JSON for the apps' cached details, encoding load()'s data again only when their entries changed
+
+    Returns None when load() finds nothing to send.
+    """
+    responses = current_app.extensions['steam_response_cache']
+    # Read before the records, so a body is never stored under a newer version than its data
+    version = await steam_service.get_many_game_versions(app_ids)
+    if version is not None:
+        encoded = responses.get(key, version)
+        if encoded is not None:
+            return encoded.to_response()
+    data = await load()
+    if data is None:
+        return None
+    if version is None:
+        # Some details were only just fetched; the next request stores the body under their versions
+        return EncodedResponse.from_data(data).to_response()
+    return responses.put(key, version, data).to_response()
+
+async def _listing_response(steam_service, key, app_ids):
+    async def load():
+        return [record.to_dict() for record in await steam_service.get_many_game_records(app_ids)]
+    return await _encoded_response(steam_service, key, app_ids, load)
+
 @steam_controller.route('/top-games', methods=['GET'])
-def get_top_games():
+async def get_top_games():
     """Get top most played games"""
     try:
         # Get limit and offset parameters from query string or use default
@@ -17,58 +45,63 @@ def get_top_games():
         offset = request.args.get('offset', default=0, type=int)
         offset = max(offset, 0)
         
-        steam_service = SteamService()
-        games = steam_service.get_top_games(limit, offset)
-        return jsonify(games)
+        steam_service = AsyncSteamService()
+        app_ids = await steam_service.get_top_game_ids(limit, offset)
+        return await _listing_response(steam_service, ("top-games", limit, offset), app_ids)
     except Exception as e:
         logger.error(f"Error in get_top_games: {e}")
         return jsonify({"error": "Failed to fetch top games"}), 500
 
 @steam_controller.route('/discounted-games', methods=['GET'])
-def get_discounted_games():
+async def get_discounted_games():
     """Get discounted games"""
     try:
         # Get limit parameter from query string or use default
         limit = request.args.get('limit', default=10, type=int)
         limit = min(limit, 30)  # Cap at 30 to prevent abuse
         
-        steam_service = SteamService()
-        games = steam_service.get_discounted_games(limit)
-        return jsonify(games)
+        steam_service = AsyncSteamService()
+        app_ids = await steam_service.get_discounted_game_ids(limit)
+        return await _listing_response(steam_service, ("discounted-games", limit), app_ids)
     except Exception as e:
         logger.error(f"Error in get_discounted_games: {e}")
         return jsonify({"error": "Failed to fetch discounted games"}), 500
 
 @steam_controller.route('/featured-games', methods=['GET'])
-def get_featured_games():
+async def get_featured_games():
     """Get featured games"""
     try:
         # Get limit parameter from query string or use default
         limit = request.args.get('limit', default=10, type=int)
         limit = min(limit, 30)  # Cap at 30 to prevent abuse
         
-        steam_service = SteamService()
-        games = steam_service.get_featured_games(limit)
-        return jsonify(games)
+        steam_service = AsyncSteamService()
+        app_ids = await steam_service.get_featured_game_ids(limit)
+        return await _listing_response(steam_service, ("featured-games", limit), app_ids)
     except Exception as e:
         logger.error(f"Error in get_featured_games: {e}")
         return jsonify({"error": "Failed to fetch featured games"}), 500
 
 @steam_controller.route('/games/<int:app_id>', methods=['GET'])
-def get_game_details(app_id):
+async def get_game_details(app_id):
     """Get detailed information for a specific game"""
     try:
-        steam_service = SteamService()
-        game = steam_service.get_game_details(app_id)
-        if game:
-            return jsonify(game)
+        steam_service = AsyncSteamService()
+
+        async def load():
+            game = await steam_service.get_game_record(app_id)
+            return game.to_dict() if game else None
+
+        response = await _encoded_response(steam_service, ("game", app_id), [app_id], load)
+        if response is not None:
+            return response
         return jsonify({"error": "Game not found"}), 404
     except Exception as e:
         logger.error(f"Error in get_game_details for app_id {app_id}: {e}")
         return jsonify({"error": "Failed to fetch game details"}), 500
 
 @steam_controller.route('/search', methods=['GET'])
-def search_games():
+async def search_games():
     """Search for games by name"""
     try:
         # Get query parameter
@@ -78,17 +111,35 @@ def search_games():
             
         # Get limit parameter
         limit = request.args.get('limit', default=20, type=int)
-        limit = min(limit, 50)  # Cap at 50 to prevent abuse
+        limit = max(min(limit, SEARCH_RESULTS_LIMIT), 1)  # Cap to the cached result size to prevent abuse
         
-        steam_service = SteamService()
-        games = steam_service.search_games(query, limit)
+        steam_service = AsyncSteamService()
+        games = await steam_service.search_games(query, limit)
         return jsonify(games)
     except Exception as e:
         logger.error(f"Error in search_games with query '{query}': {e}")
         return jsonify({"error": "Failed to search games"}), 500
 
+@steam_controller.route('/suggest', methods=['GET'])
+def suggest_games():
+    """Typeahead suggestions for catalog game titles"""
+    # Answered from memory without calling Steam, so it stays a plain sync view
+    try:
+        query = request.args.get('q', default='', type=str)
+        if not query.strip():
+            return jsonify({"error": "Suggest query is required"}), 400
+
+        limit = request.args.get('limit', default=8, type=int)
+        limit = max(min(limit, 20), 1)  # Cap at 20 to prevent abuse
+
+        suggestions = SuggestService().suggest(query, limit)
+        return jsonify(suggestions)
+    except Exception as e:
+        logger.error(f"Error in suggest_games with query '{query}': {e}")
+        return jsonify({"error": "Failed to suggest games"}), 500
+
 @steam_controller.route('/download/<int:app_id>', methods=['GET'])
-def download_game(app_id):
+async def download_game(app_id):
     """Handle game download requests with authentication"""
     try:
         # Check for user authentication
@@ -98,8 +149,8 @@ def download_game(app_id):
             
         # In a real app, we would check if the user owns the game
         # For now, we'll just return game info for download
-        steam_service = SteamService()
-        game = steam_service.get_game_details(app_id)
+        steam_service = AsyncSteamService()
+        game = await steam_service.get_game_details(app_id)
         
         if not game:
             return jsonify({"error": "Game not found"}), 404
@@ -118,13 +169,13 @@ def download_game(app_id):
         return jsonify({"error": "Failed to prepare game for download"}), 500
 
 @steam_controller.route('/games/<int:app_id>/news', methods=['GET'])
-def get_game_news(app_id):
+async def get_game_news(app_id):
     """Get news for a specific game"""
     try:
         count = request.args.get('count', default=5, type=int)
         maxlength = request.args.get('maxlength', default=500, type=int)
-        steam_service = SteamService()
-        news = steam_service.get_game_news(app_id, count, maxlength)
+        steam_service = AsyncSteamService()
+        news = await steam_service.get_game_news(app_id, count, maxlength)
         return jsonify(news)
     except Exception as e:
         logger.error(f"Error in get_game_news for app_id {app_id}: {e}")
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.services.user_service import UserService
 from app.services.admin import AdminService
+from app.utils.conditional import conditional_response, make_etag
 
 user_bp = Blueprint('users', __name__)
 
@@ -195,8 +196,8 @@ def get_current_user():
         if isinstance(current_user_id, str):
             current_user_id = int(current_user_id)
         
-        # Get current user with profile
-        user = UserService.get_user_with_profile(current_user_id)
+        # The token's user with profile, loaded once for the request by the JWT user loader
+        user = current_user
         
         if not user:
             return jsonify({
@@ -213,19 +214,24 @@ def get_current_user():
                 "logged_in": False
             }), 403
         
-        # Prepare user data with profile
-        user_data = user.serialize()
-        if user.profile:
-            user_data['profile'] = user.profile.serialize()
-        else:
-            user_data['profile'] = None
-        
-        return jsonify({
-            "success": True,
-            "message": "User is logged in",
-            "logged_in": True,
-            "data": user_data
-        }), 200
+        def build():
+            # Prepare user data with profile
+            user_data = user.serialize()
+            if user.profile:
+                user_data['profile'] = user.profile.serialize()
+            else:
+                user_data['profile'] = None
+
+            return jsonify({
+                "success": True,
+                "message": "User is logged in",
+                "logged_in": True,
+                "data": user_data
+            }), 200
+
+        # A repeat poll is answered from the loaded row's version without serializing it
+        version = UserService.get_user_version(user)
+        return conditional_response(make_etag("me", current_user_id, *version), build)
         
     except Exception as e:
         current_app.logger.error(f"Error checking user login status: {str(e)}")
@@ -241,13 +247,8 @@ def get_current_user():
 def check_authentication():
     """Simple endpoint to check if JWT token is valid"""
     try:
-        current_user_id = get_jwt_identity()
-        
-        if isinstance(current_user_id, str):
-            current_user_id = int(current_user_id)
-        
         # Just verify the user exists and is active
-        user = UserService.get_user_by_id(current_user_id)
+        user = current_user
         
         if not user:
             return jsonify({
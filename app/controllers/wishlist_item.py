@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.admin import AdminService
 from app.services.wishlist_item import WishlistService
+from app.utils.conditional import conditional_response, make_etag
+from app.utils.pagination import SORTS, encode_cursor, page_params
 
 wishlist_item_bp = Blueprint("wishlist_items", __name__)
 
@@ -9,13 +11,27 @@ wishlist_item_bp = Blueprint("wishlist_items", __name__)
 @jwt_required()
 def get_user_wishlist(user_id):
     current_user_id = get_jwt_identity()
+
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
     
     if current_user_id != user_id and not AdminService.is_admin(current_user_id):
         return jsonify({"success": False, "message": "Access to the wishlist denied"}), 403
     try:
-        wishlist_items = WishlistService.get_user_wishlist(user_id)
-        games = WishlistService.format_wishlist_response(wishlist_items)
-        return jsonify({"success": True, "message": "User wishlist retrieved successfully", "data": games}), 200
+        limit, sort, after = page_params(request.args)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    try:
+        descending = SORTS[sort]
+
+        def build():
+            wishlist_items, next_key = WishlistService.get_user_wishlist(user_id, limit, after, descending)
+            games = WishlistService.format_wishlist_response(wishlist_items)
+            return jsonify({"success": True, "message": "User wishlist retrieved successfully", "data": games,
+                            "next_cursor": encode_cursor(sort, *next_key) if next_key else None}), 200
+
+        version = WishlistService.get_user_wishlist_page_version(user_id, limit, after, descending)
+        return conditional_response(make_etag("wishlist", user_id, limit, sort, after, version), build)
     except Exception as e:
         current_app.logger.error(f"Error retrieving user wishlist: {str(e)}")
         return jsonify({"success": False, "message": "Failed to retrieve user wishlist"}), 500
@@ -25,6 +41,9 @@ def get_user_wishlist(user_id):
 @jwt_required()
 def add_wishlist_item(user_id):
     current_user_id = get_jwt_identity()
+
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
     
     if current_user_id != user_id and not AdminService.is_admin(current_user_id):
         return jsonify({"success": False, "message": "Access denied"}), 403
@@ -53,6 +72,9 @@ def add_wishlist_item(user_id):
 @jwt_required()
 def delete_item_from_wishlist(user_id, game_id):
     current_user_id = get_jwt_identity()
+
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
     
     if current_user_id != user_id and not AdminService.is_admin(current_user_id):
         return jsonify({"success": False, "message": "Access to wishlist denied"}), 403
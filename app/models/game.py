@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from sqlalchemy import String, DateTime, Integer, Numeric, Float, Text
 from sqlalchemy.orm import mapped_column, relationship
 from app.extensions import db
@@ -6,6 +7,10 @@ from app.extensions import db
 class Game(db.Model):
     __tablename__ = "games"
 
+    # Columns serialize() reads, in order
+    SERIALIZED_FIELDS = ("id", "title", "price", "release_year", "status", "category",
+                         "description", "platform", "rating", "image_url")
+
     id = mapped_column(Integer, primary_key=True)
     title = mapped_column(String(255), nullable=False)
     price = mapped_column(Numeric(10, 2), nullable=False)
@@ -16,6 +21,11 @@ class Game(db.Model):
     platform = mapped_column(String(255), nullable=False)
     rating = mapped_column(Float, nullable=True)
     image_url = mapped_column(String(255), nullable=True)
+    steam_appid = mapped_column(Integer, unique=True, nullable=True, index=True)
+    fetched_at = mapped_column(DateTime, nullable=True)
+    # Nullable because rows predating it have no value; every ORM write sets it
+    updated_at = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc),
+                               onupdate=lambda: datetime.now(timezone.utc), nullable=True)
 
     user_library_entries = relationship("UserLibrary", back_populates="game")
     wishlist_items = relationship("WishlistItem", back_populates="game")
@@ -34,3 +44,32 @@ class Game(db.Model):
             "rating": self.rating,
             "image_url": self.image_url
         }
+
+    @classmethod
+    def serialized_columns(cls):
+        """serialize()'s columns labelled game_<name>, for queries that project games instead of loading them"""
+        return tuple(getattr(cls, name).label(f"game_{name}") for name in cls.SERIALIZED_FIELDS)
+
+    @classmethod
+    def serialize_row(cls, row):
+        """serialize() for a row selected with serialized_columns(); None when an outer join found no game"""
+        if row.game_id is None:
+            return None
+        data = {name: getattr(row, f"game_{name}") for name in cls.SERIALIZED_FIELDS}
+        data["price"] = str(data["price"])
+        return data
+
+    def serialize_steam_app(self):
+        """Serialize a catalog row in the same shape SteamService returns for an app"""
+        return {
+            "id": self.steam_appid,
+            "title": self.title,
+            "price": str(float(self.price)),
+            "release_year": self.release_year,
+            "status": self.status,
+            "category": self.category,
+            "description": self.description,
+            "platform": self.platform,
+            "rating": self.rating,
+            "image_url": self.image_url
+        }
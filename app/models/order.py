@@ -18,6 +18,10 @@ class Order(db.Model):
     user = relationship("User", back_populates="orders")
     order_items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        db.Index('ix_orders_user_id_order_date', 'user_id', 'order_date'),
+    )
+
     def serialize(self):
         return {
             "id": self.id,
@@ -7,8 +7,8 @@ class OrderItem(db.Model):
     __tablename__ = "order_items"
 
     id = mapped_column(Integer, primary_key=True)
-    order_id = mapped_column(Integer, ForeignKey("orders.id"), nullable=False)
-    game_id = mapped_column(Integer, ForeignKey("games.id"), nullable=False)
+    order_id = mapped_column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    game_id = mapped_column(Integer, ForeignKey("games.id"), nullable=False, index=True)
     quantity = mapped_column(Integer, nullable=False, default=1)
     price = mapped_column(Numeric(10, 2), nullable=False)
 
@@ -9,7 +9,7 @@ class UserLibrary(db.Model):
 
     id = mapped_column(Integer, primary_key=True)
     user_id = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
-    game_id = mapped_column(Integer, ForeignKey("games.id"), nullable=False)
+    game_id = mapped_column(Integer, ForeignKey("games.id"), nullable=False, index=True)
     added_at = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
 
@@ -19,6 +19,8 @@ class UserLibrary(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('user_id', 'game_id', name='unique_user_game_library'),
+        # Keyset pages of a user's library, newest or oldest first
+        db.Index('ix_user_library_user_id_added_at', 'user_id', 'added_at', 'id'),
     )
 
     def serialize(self):
@@ -3,3 +3,4 @@ from app.repositories.library import LibraryRepository
 from app.repositories.profile_repository import ProfileRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.wishlist_item import WishlistItemRepository
+from app.repositories.game_repository import GameRepository
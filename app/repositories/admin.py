@@ -1,6 +1,7 @@
 # Admin Repository
 from app.extensions import db
 from app.models.user import User
+from app.utils.role_cache import Roles
 from sqlalchemy import select
 from typing import List, Optional
 
@@ -90,7 +91,7 @@ class AdminRepository:
         return admin_users
     
     @staticmethod
-    def is_admin(user_id: int) -> bool:
-        stmt = select(User).where(User.id == user_id, User.is_admin == True)
-        admin_user = db.session.execute(stmt).scalar_one_or_none()
-        return admin_user is not None
\ No newline at end of file
+    def get_roles(user_id: int) -> Optional[Roles]:
+        stmt = select(User.is_admin, User.is_active).where(User.id == user_id)
+        row = db.session.execute(stmt).one_or_none()
+        return Roles(*row) if row is not None else None
\ No newline at end of file
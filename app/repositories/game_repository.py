@@ -0,0 +1,122 @@
+import re
+from datetime import datetime, timezone
+from app.extensions import db
+from app.models.game import Game
+from sqlalchemy import select, func, literal_column, text, and_
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+
+# Words only, so user input can never inject tsquery or FTS5 query syntax
+_SEARCH_TERM_RE = re.compile(r"\w+")
+
+
+class GameRepository:
+    @staticmethod
+    def get_by_steam_appid(app_id: int) -> Optional[Game]:
+        """Get catalog game by Steam app ID"""
+        stmt = select(Game).where(Game.steam_appid == app_id)
+        return db.session.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def upsert_steam_game(game_data: dict) -> Game:
+        """Insert or refresh a catalog game from formatted Steam app data"""
+        app_id = game_data['id']
+        game = GameRepository.get_by_steam_appid(app_id)
+        if not game:
+            game = Game(steam_appid=app_id)
+            db.session.add(game)
+
+        GameRepository._apply_steam_data(game, game_data)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker inserted the same app first; update its row instead
+            db.session.rollback()
+            game = GameRepository.get_by_steam_appid(app_id)
+            GameRepository._apply_steam_data(game, game_data)
+            db.session.commit()
+        return game
+
+    @staticmethod
+    def update_steam_prices(prices: dict) -> None:
+        """Update catalog prices by Steam app ID without touching fetched_at"""
+        if not prices:
+            return
+        stmt = select(Game).where(Game.steam_appid.in_(list(prices)))
+        for game in db.session.execute(stmt).scalars():
+            game.price = prices[game.steam_appid]
+        db.session.commit()
+
+    @staticmethod
+    def list_steam_titles(since: Optional[datetime] = None) -> list:
+        """(steam_appid, title, rating, fetched_at) of catalog Steam games, optionally fetched since a time"""
+        stmt = select(Game.steam_appid, Game.title, Game.rating, Game.fetched_at).where(Game.steam_appid.isnot(None))
+        if since is not None:
+            stmt = stmt.where(Game.fetched_at >= since)
+        return list(db.session.execute(stmt.order_by(Game.fetched_at)))
+
+    @staticmethod
+    def search_steam_games(query: str, limit: int) -> List[Game]:
+        """Rank catalog Steam games whose indexed text starts with every word of the query"""
+        terms = _SEARCH_TERM_RE.findall(query.lower())
+        if not terms:
+            return []
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            return GameRepository._search_tsvector(terms, limit)
+        if dialect == 'sqlite' and GameRepository._has_fts5_index():
+            return GameRepository._search_fts5(terms, limit)
+        return GameRepository._search_like(terms, limit)
+
+    @staticmethod
+    def _search_tsvector(terms: List[str], limit: int) -> List[Game]:
+        tsquery = func.to_tsquery('english', ' & '.join(f"{term}:*" for term in terms))
+        search_vector = literal_column('games.search_vector')
+        stmt = (
+            select(Game)
+            .where(Game.steam_appid.isnot(None), search_vector.op('@@')(tsquery))
+            .order_by(func.ts_rank(search_vector, tsquery).desc(), Game.rating.desc().nullslast())
+            .limit(limit)
+        )
+        return list(db.session.execute(stmt).scalars())
+
+    @staticmethod
+    def _has_fts5_index() -> bool:
+        stmt = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'games_fts'")
+        return db.session.execute(stmt).first() is not None
+
+    @staticmethod
+    def _search_fts5(terms: List[str], limit: int) -> List[Game]:
+        # bm25 weights follow the column order: title, category, platform, description
+        stmt = text(
+            "SELECT games.id FROM games_fts JOIN games ON games.id = games_fts.rowid "
+            "WHERE games_fts MATCH :match AND games.steam_appid IS NOT NULL "
+            "ORDER BY bm25(games_fts, 10.0, 4.0, 2.0, 1.0) LIMIT :limit"
+        )
+        match = ' '.join(f'"{term}"*' for term in terms)
+        ids = [row[0] for row in db.session.execute(stmt, {"match": match, "limit": limit})]
+        games = {game.id: game for game in db.session.execute(select(Game).where(Game.id.in_(ids))).scalars()}
+        return [games[game_id] for game_id in ids if game_id in games]
+
+    @staticmethod
+    def _search_like(terms: List[str], limit: int) -> List[Game]:
+        stmt = (
+            select(Game)
+            .where(Game.steam_appid.isnot(None), and_(*(Game.title.ilike(f"%{term}%") for term in terms)))
+            .order_by(Game.rating.desc().nullslast(), Game.title)
+            .limit(limit)
+        )
+        return list(db.session.execute(stmt).scalars())
+
+    @staticmethod
+    def _apply_steam_data(game: Game, game_data: dict) -> None:
+        game.title = (game_data.get('title') or '')[:255]
+        game.price = game_data.get('price')
+        game.release_year = game_data.get('release_year')
+        game.status = game_data.get('status')
+        game.category = game_data.get('category')[:255]
+        game.description = game_data.get('description')
+        game.platform = game_data.get('platform')
+        game.rating = game_data.get('rating')
+        game.image_url = game_data.get('image_url')
+        game.fetched_at = datetime.now(timezone.utc)
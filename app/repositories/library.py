@@ -1,16 +1,32 @@
 # Library Repository
 from app.extensions import db
+from app.models.game import Game
 from app.models.user_library import UserLibrary
+from app.utils.pagination import keyset_page
 from sqlalchemy import select
 from typing import List, Optional
 
 class LibraryRepository:
     @staticmethod
-    def get_user_library(user_id: int) -> List[UserLibrary]:
-        stmt = select(UserLibrary).where(UserLibrary.user_id == user_id)
-        library_items = db.session.execute(stmt).scalars().all()
-        return library_items
+    def get_user_library(user_id: int, limit: int, after: Optional[tuple] = None, descending: bool = True) -> list:
+        """Up to limit + 1 library rows after the (added_at, id) key, with their game's serialized columns"""
+        stmt = (
+            select(UserLibrary.id.label("library_id"), UserLibrary.added_at, *Game.serialized_columns())
+            .outerjoin(Game, UserLibrary.game_id == Game.id)
+            .where(UserLibrary.user_id == user_id)
+        )
+        return db.session.execute(keyset_page(stmt, UserLibrary.added_at, UserLibrary.id, limit, after, descending)).all()
     
+    @staticmethod
+    def get_user_library_page_version(user_id: int, limit: int, after: Optional[tuple] = None, descending: bool = True) -> list:
+        """(id, added_at, game updated_at) of the rows get_user_library would return, without their columns"""
+        stmt = (
+            select(UserLibrary.id, UserLibrary.added_at, Game.updated_at)
+            .outerjoin(Game, UserLibrary.game_id == Game.id)
+            .where(UserLibrary.user_id == user_id)
+        )
+        return [tuple(row) for row in db.session.execute(keyset_page(stmt, UserLibrary.added_at, UserLibrary.id, limit, after, descending))]
+
     @staticmethod
     def get_library_item(user_id: int, game_id: int) -> Optional[UserLibrary]:
         stmt = select(UserLibrary).where(
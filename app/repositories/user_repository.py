@@ -47,7 +47,8 @@ class UserRepository:
     @staticmethod
     def update_user(user_id: int, **kwargs) -> User:
         """Update user information"""
-        user = UserRepository.get_by_id(user_id)
+        # session.get answers from the session's identity map when the request already loaded the user
+        user = db.session.get(User, user_id)
         if not user:
             raise ValueError(f"User not found with id {user_id}")
         
@@ -1,15 +1,31 @@
 from app.extensions import db
+from app.models.game import Game
 from app.models.wishlist_item import WishlistItem
+from app.utils.pagination import keyset_page
 from sqlalchemy import select
 from typing import List, Optional
 
 class WishlistItemRepository:
     @staticmethod
-    def get_user_wishlist(user_id: int) -> List[WishlistItem]:
-        stmt = select(WishlistItem).where(WishlistItem.user_id == user_id)
-        wishlist_items = db.session.execute(stmt).scalars().all()
-        return wishlist_items
+    def get_user_wishlist(user_id: int, limit: int, after: Optional[tuple] = None, descending: bool = True) -> list:
+        """Up to limit + 1 wishlist rows after the (created_at, id) key, with their game's serialized columns"""
+        stmt = (
+            select(WishlistItem.id.label("wishlist_id"), WishlistItem.created_at, *Game.serialized_columns())
+            .outerjoin(Game, WishlistItem.game_id == Game.id)
+            .where(WishlistItem.user_id == user_id)
+        )
+        return db.session.execute(keyset_page(stmt, WishlistItem.created_at, WishlistItem.id, limit, after, descending)).all()
     
+    @staticmethod
+    def get_user_wishlist_page_version(user_id: int, limit: int, after: Optional[tuple] = None, descending: bool = True) -> list:
+        """(id, created_at, game updated_at) of the rows get_user_wishlist would return, without their columns"""
+        stmt = (
+            select(WishlistItem.id, WishlistItem.created_at, Game.updated_at)
+            .outerjoin(Game, WishlistItem.game_id == Game.id)
+            .where(WishlistItem.user_id == user_id)
+        )
+        return [tuple(row) for row in db.session.execute(keyset_page(stmt, WishlistItem.created_at, WishlistItem.id, limit, after, descending))]
+
     @staticmethod
     def get_wishlist_item(user_id: int, game_id: int) -> Optional[WishlistItem]:
         stmt = select(WishlistItem).where(
@@ -1,9 +1,12 @@
 # Admin Service
-import requests
 import json
 import logging
+from flask import current_app, has_request_context
+from flask_jwt_extended import get_jwt, get_jwt_identity
 from typing import List, Optional, Dict, Any
 from app.repositories.admin import AdminRepository
+from app.utils.identity import loaded_identity
+from app.utils.role_cache import Roles
 
 class AdminService:
 
@@ -36,7 +39,8 @@ class AdminService:
     @staticmethod
     def fetch_game_data_from_steam(app_id: str):
         try:
-            response = requests.get(
+            current_app.extensions['steam_rate_limiter'].acquire('store')
+            response = current_app.extensions['http_client'].get(
                 f"https://store.steampowered.com/api/appdetails?appids={app_id}")
             if response.status_code == 200:
                 data = response.json()
@@ -49,4 +53,40 @@ class AdminService:
 
     @staticmethod
     def is_admin(user_id: int) -> bool:
-        return AdminRepository.is_admin(user_id)
+        roles = AdminService.get_roles(user_id)
+        return roles is not None and roles.is_admin
+
+    @staticmethod
+    def get_roles(user_id: int) -> Optional[Roles]:
+        """A user's admin/active flags from the user this request loaded, the role cache, the token's claims or `users`"""
+        user_id = int(user_id)
+        role_cache = current_app.extensions['role_cache']
+        user = loaded_identity(user_id) if has_request_context() else None
+        if user is not None:
+            return Roles(bool(user.is_admin), bool(user.is_active))
+        roles = role_cache.get(user_id) or AdminService._roles_from_token(user_id)
+        if roles is None:
+            roles = AdminRepository.get_roles(user_id)
+            if roles is not None:
+                role_cache.put(user_id, roles)
+        return roles
+
+    @staticmethod
+    def invalidate_roles(user_id: int):
+        current_app.extensions['role_cache'].invalidate(int(user_id))
+
+    @staticmethod
+    def _roles_from_token(user_id: int) -> Optional[Roles]:
+        if not has_request_context():
+            return None
+        try:
+            claims = get_jwt()
+            identity = get_jwt_identity()
+        except RuntimeError:
+            # Not a @jwt_required request
+            return None
+        if str(identity) != str(user_id) or 'is_admin' not in claims or 'is_active' not in claims:
+            return None
+        if not current_app.extensions['role_cache'].trusts_claims(user_id, claims.get('iat', 0)):
+            return None
+        return Roles(bool(claims['is_admin']), bool(claims['is_active']))
@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import time
+from flask import current_app
+from app.services.steam_service import (
+    SteamService,
+    GameRecord,
+    TOP_GAMES_PAGE,
+    DISCOUNTED_GAMES_PAGE,
+    FEATURED_GAMES_PAGE,
+    SEARCH_RESULTS_LIMIT,
+)
+from app.utils.cache import MemoryCache
+from app.utils.http_client import TOO_MANY_REQUESTS
+from app.utils.rate_limiter import SQLiteTokenBucket
+from app.utils.text import clean_query, normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSteamService:
+    """Coroutine counterpart of SteamService for the async /api/steam views
+
+    Reads the same cache, catalog and rate-limit budgets as SteamService and
+    shares its in-flight table, but sends upstream calls through the pooled
+    httpx client, so a listing's detail fetches run concurrently instead of
+    queueing on the fetch thread pool. Stale entries are still refreshed on
+    SteamService's background threads.
+    """
+
+    def __init__(self):
+        self.steam = SteamService()
+        self.cache = self.steam.cache
+        self.http = current_app.extensions['async_http_client']
+        # The SQLite cache and token buckets wait on file locks, so their calls run on worker threads;
+        # the in-memory ones are cheaper to call inline than to hand off
+        self._blocking_cache = not isinstance(self.cache, MemoryCache)
+        self._blocking_limiter = any(
+            isinstance(bucket, SQLiteTokenBucket) for bucket in self.steam.rate_limiter.buckets.values()
+        )
+
+    async def _cache_call(self, fn, *args):
+        if self._blocking_cache:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def _throttle(self, budget):
+        # Reserve under the bucket's lock, then sleep without blocking the loop
+        if self._blocking_limiter:
+            wait = await asyncio.to_thread(self.steam.rate_limiter.reserve, budget)
+        else:
+            wait = self.steam.rate_limiter.reserve(budget)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _get_json(self, budget, url, params=None):
+        for attempt in range(self.http.retries + 1):
+            await self._throttle(budget)
+            response = await self.http.get(url, params=params)
+            if response.status_code != TOO_MANY_REQUESTS or attempt == self.http.retries:
+                break
+            delay = self.steam._retry_delay(response, attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_or_load(self, cache_key, loader, refresh):
+        """Serve cache_key from the cache, or await one shared load for all concurrent callers
+
+        refresh is the synchronous loader handed to the background refresh
+        when the entry is past its soft TTL.
+        """
+        entry = await self._cache_call(self.cache.get_entry, cache_key)
+        if entry is not None:
+            cached, fresh_until = entry
+            if fresh_until <= time.time():
+                logger.info(f"Serving stale {cache_key} while it refreshes")
+                self.steam._schedule_refresh(cache_key, refresh)
+            else:
+                logger.info(f"Cache hit for {cache_key}")
+            return cached
+        return await self.steam._inflight.do_async(cache_key, lambda: self._load(cache_key, loader))
+
+    async def _load(self, cache_key, loader):
+        cached = await self._cache_call(self.cache.get, cache_key)
+        if cached is not None:
+            return cached
+        return await self._cache_call(self.steam._store, cache_key, await loader())
+
+    async def get_top_games(self, limit=30, offset=0):
+        """Get top most played games"""
+        return [game.to_dict() for game in await self.get_top_game_records(limit, offset)]
+
+    async def get_top_game_records(self, limit=30, offset=0):
+        return await self.get_many_game_records(await self.get_top_game_ids(limit, offset))
+
+    async def get_top_game_ids(self, limit=30, offset=0):
+        try:
+            app_ids = await self._cache_call(self.steam._get_warm_page, TOP_GAMES_PAGE, limit, offset)
+            if app_ids is None:
+                app_ids = (await self._get_or_load(
+                    "top_game_ids", self._fetch_top_game_ids, self.steam._fetch_top_game_ids
+                ))[offset:offset+limit]
+            return app_ids
+        except Exception as e:
+            logger.error(f"Error fetching top games: {e}")
+            return []
+
+    async def _fetch_top_game_ids(self):
+        data = await self._get_json('api', f"{self.steam.base_url}/ISteamChartsService/GetMostPlayedGames/v1/")
+        return self.steam._parse_top_game_ids(data)
+
+    async def get_discounted_games(self, limit=10):
+        """Get discounted games"""
+        return [game.to_dict() for game in await self.get_discounted_game_records(limit)]
+
+    async def get_discounted_game_records(self, limit=10):
+        return await self.get_many_game_records(await self.get_discounted_game_ids(limit))
+
+    async def get_discounted_game_ids(self, limit=10):
+        try:
+            app_ids = await self._cache_call(self.steam._get_warm_page, DISCOUNTED_GAMES_PAGE, limit)
+            if app_ids is None:
+                app_ids = (await self._get_or_load(
+                    "discounted_game_ids", self._fetch_discounted_game_ids, self.steam._fetch_discounted_game_ids
+                ))[:limit]
+            return app_ids
+        except Exception as e:
+            logger.error(f"Error fetching discounted games: {e}")
+            return []
+
+    async def _fetch_discounted_game_ids(self):
+        data = await self._get_json('store', f"{self.steam.store_url}/featuredcategories/", {"l": "english"})
+        return self.steam._parse_discounted_game_ids(data)
+
+    async def get_featured_games(self, limit=10):
+        """Get featured games"""
+        return [game.to_dict() for game in await self.get_featured_game_records(limit)]
+
+    async def get_featured_game_records(self, limit=10):
+        return await self.get_many_game_records(await self.get_featured_game_ids(limit))
+
+    async def get_featured_game_ids(self, limit=10):
+        try:
+            app_ids = await self._cache_call(self.steam._get_warm_page, FEATURED_GAMES_PAGE, limit)
+            if app_ids is None:
+                app_ids = (await self._get_or_load(
+                    "featured_game_ids", self._fetch_featured_game_ids, self.steam._fetch_featured_game_ids
+                ))[:limit]
+            return app_ids
+        except Exception as e:
+            logger.error(f"Error fetching featured games: {e}")
+            return []
+
+    async def _fetch_featured_game_ids(self):
+        data = await self._get_json('store', f"{self.steam.store_url}/featured/", {"l": "english"})
+        return self.steam._parse_featured_game_ids(data)
+
+    async def get_game_details(self, app_id):
+        """Get detailed information for a specific game"""
+        game = await self.get_game_record(app_id)
+        return game.to_dict() if game else None
+
+    async def get_game_record(self, app_id):
+        try:
+            return GameRecord.load(await self._get_or_load(
+                str(app_id),
+                lambda: self._load_game_details(app_id),
+                lambda: self.steam._fetch_game_details(app_id),
+            ))
+        except Exception as e:
+            logger.error(f"Error fetching game details for app_id {app_id}: {e}")
+            return None
+
+    async def get_many_game_details(self, app_ids):
+        """Get details for several apps, fetching every cache miss concurrently"""
+        return [game.to_dict() for game in await self.get_many_game_records(app_ids)]
+
+    async def get_many_game_records(self, app_ids):
+        app_ids = [app_id for app_id in app_ids if app_id]
+        if not app_ids:
+            return []
+        entries = await self._cache_call(self.cache.get_many_entries, [str(app_id) for app_id in app_ids])
+        now = time.time()
+        details = {}
+        missing = []
+        for app_id in dict.fromkeys(app_ids):
+            cache_key = str(app_id)
+            entry = entries.get(cache_key)
+            if entry is None:
+                missing.append(app_id)
+                continue
+            details[app_id] = GameRecord.load(entry[0])
+            if entry[1] <= now:
+                self.steam._schedule_refresh(cache_key, lambda app_id=app_id: self.steam._fetch_game_details(app_id))
+        if missing:
+            logger.info(f"Resolving {len(missing)} of {len(app_ids)} apps upstream")
+            results = await asyncio.gather(*(self.get_game_record(app_id) for app_id in missing))
+            details.update(zip(missing, results))
+        return [details[app_id] for app_id in app_ids if details.get(app_id)]
+
+    async def get_many_game_versions(self, app_ids):
+        """Identify the current detail entries of app_ids without reading them, or None unless all are cached
+
+        Entries past their soft TTL are refreshed in the background, as
+        when their records are read.
+        """
+        keys = [str(app_id) for app_id in app_ids]
+        entries = await self._cache_call(self.cache.get_many_versions, keys)
+        if any(key not in entries for key in keys):
+            return None
+        now = time.time()
+        for app_id, key in zip(app_ids, keys):
+            if entries[key][1] <= now:
+                self.steam._schedule_refresh(key, lambda app_id=app_id: self.steam._fetch_game_details(app_id))
+        return tuple(app_ids), tuple(entries[key][0] for key in keys)
+
+    async def _load_game_details(self, app_id):
+        # Catalog reads and writes are blocking database calls, so they run off the loop
+        game = await asyncio.to_thread(self.steam._read_catalog_game, app_id)
+        if game is not None:
+            return game
+        data = await self._get_json('store', f"{self.steam.store_url}/appdetails", {"appids": app_id, "l": "english"})
+        formatted_data = self.steam._parse_game_details(app_id, data)
+        if formatted_data and formatted_data.get('id'):
+            await asyncio.to_thread(self.steam._persist_game, formatted_data)
+        return GameRecord.from_dict(formatted_data) if formatted_data else None
+
+    async def search_games(self, query, limit=20):
+        """Search for games by name, from the local catalog index when it has enough matches"""
+        try:
+            term = clean_query(query)
+            if not term:
+                return []
+            cache_key = f"search_{normalize_text(term) or term}"
+            if await self._cache_call(self.cache.get_entry, cache_key) is None:
+                games = await asyncio.to_thread(self.steam._search_catalog, term, limit)
+                if games is not None:
+                    return games
+            app_ids = await self._get_or_load(
+                cache_key,
+                lambda: self._fetch_search_ids(term),
+                lambda: self.steam._fetch_search_ids(term),
+            )
+            return await self.get_many_game_details(app_ids[:limit])
+        except Exception as e:
+            logger.error(f"Error searching games with query '{query}': {e}")
+            return []
+
+    async def _fetch_search_ids(self, term):
+        params = {"term": term, "l": "english", "cc": "US"}
+        data = await self._get_json('store', f"{self.steam.store_url}/storesearch/", params)
+        return self.steam._parse_search_ids(data)[:SEARCH_RESULTS_LIMIT]
+
+    async def get_game_news(self, app_id, count=5, maxlength=500):
+        """Fetch news for a specific game from Steam API"""
+        try:
+            cache_key = f"news_{app_id}_{count}_{maxlength}"
+            return await self._get_or_load(
+                cache_key,
+                lambda: self._fetch_game_news(app_id, count, maxlength),
+                lambda: self.steam._fetch_game_news(app_id, count, maxlength),
+            )
+        except Exception as e:
+            logger.error(f"Error fetching news for app_id {app_id}: {e}")
+            return []
+
+    async def _fetch_game_news(self, app_id, count, maxlength):
+        url = f"{self.steam.base_url}/ISteamNews/GetNewsForApp/v0002/"
+        params = {"appid": app_id, "count": count, "maxlength": maxlength, "format": "json"}
+        return self.steam._parse_game_news(await self._get_json('api', url, params))
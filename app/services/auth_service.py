@@ -24,3 +24,8 @@ class AuthService:
         except Exception as e:
             db.session.rollback()
             raise ValueError(f"Registration failed: {str(e)}")
+
+    @staticmethod
+    def role_claims(user: User) -> dict:
+        """Access token claims that spare AdminService a `users` lookup while the token is fresh"""
+        return {"is_admin": bool(user.is_admin), "is_active": bool(user.is_active)}
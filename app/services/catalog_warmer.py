@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.services.steam_service import SteamService
+
+logger = logging.getLogger(__name__)
+
+steam_cli = AppGroup("steam", help="Steam catalog maintenance commands.")
+
+DEFAULT_CLI_INTERVAL = 300
+
+
+class CatalogWarmer:
+    """Periodically rebuilds the Steam homepage listings so requests only read the cache"""
+
+    def __init__(self, app, interval):
+        self.app = app
+        self.interval = interval
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        started = time.monotonic()
+        with self.app.app_context():
+            stats = SteamService().warm_listings(
+                current_app.config["STEAM_WARMER_TOP_GAMES"],
+                current_app.config["STEAM_WARMER_LISTING_SIZE"],
+            )
+            # Counters are cumulative for this process, so a throttled run shows up as a jump
+            stats["rate_limits"] = current_app.extensions["steam_rate_limiter"].stats()
+        stats["duration"] = round(time.monotonic() - started, 3)
+        self.last_run = stats
+        logger.info(
+            f"Catalog warmer refreshed {stats['refreshed']} apps with "
+            f"{stats['errors']} errors in {stats['duration']}s; rate limits: "
+            + "; ".join(f"{name} {_format_bucket(bucket)}" for name, bucket in stats["rate_limits"].items())
+        )
+        return stats
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="steam-catalog-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Catalog warmer run failed: {e}")
+            self._stop.wait(self.interval)
+
+
+def _format_bucket(bucket):
+    return (
+        f"acquired={bucket['acquired']} rejected={bucket['rejected']} waited={bucket['waited']} "
+        f"total_wait={bucket['total_wait']:.2f}s max_wait={bucket['max_wait']:.2f}s"
+    )
+
+
+def init_catalog_warmer(app):
+    app.cli.add_command(steam_cli)
+    interval = app.config["STEAM_WARMER_INTERVAL"]
+    if interval > 0:
+        warmer = CatalogWarmer(app, interval)
+        app.extensions["steam_catalog_warmer"] = warmer
+        warmer.start()
+
+
+@steam_cli.command("warm")
+@click.option("--loop", is_flag=True, help="Keep warming every --interval seconds instead of running once.")
+@click.option("--interval", type=int, default=None, help="Seconds between runs (defaults to STEAM_WARMER_INTERVAL).")
+def warm_command(loop, interval):
+    """Fetch the homepage listings and store the assembled pages in the cache."""
+    interval = interval or current_app.config["STEAM_WARMER_INTERVAL"] or DEFAULT_CLI_INTERVAL
+    warmer = CatalogWarmer(current_app._get_current_object(), interval)
+    while True:
+        stats = warmer.run_once()
+        click.echo(f"refreshed={stats['refreshed']} errors={stats['errors']} duration={stats['duration']}s")
+        for name, bucket in stats["rate_limits"].items():
+            click.echo(f"rate_limit[{name}] {_format_bucket(bucket)}")
+        if not loop:
+            break
+        time.sleep(interval)
@@ -7,8 +7,17 @@ from typing import List, Optional, Dict, Any
 
 class LibraryService:
     @staticmethod
-    def get_user_library(user_id: int):
-        return LibraryRepository.get_user_library(user_id)
+    def get_user_library(user_id: int, limit: int, after=None, descending: bool = True):
+        """One page of a user's library and the (added_at, id) key of its last row, or None on the last page"""
+        rows = LibraryRepository.get_user_library(user_id, limit, after, descending)
+        page = rows[:limit]
+        next_key = (page[-1].added_at, page[-1].library_id) if len(rows) > limit else None
+        return page, next_key
+    
+    @staticmethod
+    def get_user_library_page_version(user_id: int, limit: int, after=None, descending: bool = True):
+        rows = LibraryRepository.get_user_library_page_version(user_id, limit, after, descending)
+        return rows[:limit], len(rows) > limit
     
     @staticmethod
     def get_library_item(user_id: int, game_id: int):
@@ -33,12 +42,12 @@ class LibraryService:
         return LibraryRepository.remove_from_library(user_id, game_id)
     
     @staticmethod
-    def format_library_response(library_items):
+    def format_library_response(library_rows):
         formatted_items = []
-        for item in library_items:
+        for row in library_rows:
             formatted_items.append({
-                "library_id": item.id,
-                "added_at": item.added_at,
-                "game": item.game.serialize() if item.game else None
+                "library_id": row.library_id,
+                "added_at": row.added_at,
+                "game": Game.serialize_row(row)
             })
         return formatted_items
@@ -1,56 +1,122 @@
-import requests
 import logging
+import sys
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app
-from datetime import datetime
-import re
+from datetime import datetime, timedelta, timezone
+from app.extensions import db
+from app.repositories.game_repository import GameRepository
+from app.utils.html_sanitizer import sanitize_html_description
+from app.utils.http_client import TOO_MANY_REQUESTS, retry_after
+from app.utils.singleflight import SingleFlight
+from app.utils.text import clean_query, normalize_text
 
 logger = logging.getLogger(__name__)
 
+# Cache keys of the full listing pages assembled by the catalog warmer
+TOP_GAMES_PAGE = "top_games_page"
+DISCOUNTED_GAMES_PAGE = "discounted_games_page"
+FEATURED_GAMES_PAGE = "featured_games_page"
+# Searches are fetched and cached once at this size; smaller limits slice the cached ids
+SEARCH_RESULTS_LIMIT = 50
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class GameRecord(namedtuple("GameRecord", [
+    "id", "title", "price", "release_year", "status", "category", "description", "platform", "rating", "image_url",
+])):
+    """Cached form of a formatted app: one tuple instead of a dict, with its repeated labels interned
+
+    Listing and search entries only hold app ids, so this is the single
+    cached copy of an app. The SQLite cache hands records back as lists.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, game):
+        return cls(
+            game.get('id'), game.get('title'), _intern(game.get('price')), game.get('release_year'),
+            _intern(game.get('status')), _intern(game.get('category')), game.get('description'),
+            _intern(game.get('platform')), game.get('rating'), game.get('image_url'),
+        )
+
+    @classmethod
+    def load(cls, value):
+        if value is None or isinstance(value, cls):
+            return value
+        return cls.from_dict(dict(zip(cls._fields, value)))
+
+    def to_dict(self):
+        return dict(zip(self._fields, self))
+
+
 class SteamService:
-    # In-memory cache for game details
-    _game_cache = {}
-    _cache_expiry = 3600  # Cache expiry in seconds (1 hour)
-    _last_fetch_time = {}  # Throttling tracker
+    _executor = None
+    _executor_lock = threading.Lock()
+    # Concurrent misses for the same cache key share one upstream fetch
+    _inflight = SingleFlight()
+    # Stale entries are refreshed on their own pool so a refresh never waits behind detail fetches
+    _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="steam-refresh")
+    _refreshing = set()
+    _refreshing_lock = threading.Lock()
 
     def __init__(self):
+        self.app = current_app._get_current_object()
         self.api_key = current_app.config['STEAM_API_KEY']
-        self.base_url = "https://api.steampowered.com"
-        self.store_url = "https://store.steampowered.com/api"
+        self.cache = current_app.extensions['steam_cache']
+        self.http = current_app.extensions['http_client']
+        self.cache_ttl = current_app.config['STEAM_CACHE_TTL']
+        self.cache_soft_ttl = current_app.config['STEAM_CACHE_SOFT_TTL']
+        self.catalog_ttl = current_app.config['STEAM_CATALOG_TTL']
+        self.search_min_hits = current_app.config['STEAM_SEARCH_MIN_LOCAL_HITS']
+        self.base_url = current_app.config['STEAM_API_URL']
+        self.store_url = current_app.config['STEAM_STORE_URL']
+        self.max_workers = current_app.config['STEAM_MAX_WORKERS']
+        self.price_batch_size = current_app.config['STEAM_PRICE_BATCH_SIZE']
+        self.rate_limiter = current_app.extensions['steam_rate_limiter']
+        self.retry_after_max = current_app.config['STEAM_RATE_LIMIT_MAX_WAIT']
+
+    def _throttle(self, budget):
+        """Wait for a token from the api or store budget before sending a request upstream"""
+        self.rate_limiter.acquire(budget)
+
+    def _get_json(self, budget, url, params=None):
+        # Every attempt takes a token, so a throttled host's retries stay inside its budget
+        for attempt in range(self.http.retries + 1):
+            self._throttle(budget)
+            response = self.http.get(url, params=params)
+            if response.status_code != TOO_MANY_REQUESTS or attempt == self.http.retries:
+                break
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                break
+            time.sleep(delay)
+        response.raise_for_status()
+        return response.json()
+
+    def _retry_delay(self, response, attempt):
+        """How long to wait before retrying a 429, or None when its Retry-After is past the rate limit's max wait"""
+        delay = retry_after(response, self.http.backoff * (2 ** attempt))
+        if delay > self.retry_after_max:
+            logger.warning(f"Not retrying {response.url}: Retry-After of {delay:.0f}s")
+            return None
+        return delay
+
+    @classmethod
+    def _get_executor(cls, max_workers):
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="steam-fetch")
+            return cls._executor
 
     def _sanitize_html_description(self, description):
         """Clean HTML description from Steam API"""
-        if not description:
-            return ""
-            
-        # Replace problematic HTML tags with proper formatting
-        # Replace <br> tags with newlines
-        cleaned = re.sub(r'<br\s*/?>', '\n', description)
-        
-        # Handle lists
-        cleaned = re.sub(r'<ul[^>]*>', '\n', cleaned)
-        cleaned = re.sub(r'</ul>', '\n', cleaned)
-        cleaned = re.sub(r'<li[^>]*>', '• ', cleaned)
-        cleaned = re.sub(r'</li>', '\n', cleaned)
-        
-        # Remove other common HTML tags
-        cleaned = re.sub(r'<h[1-6][^>]*>(.*?)</h[1-6]>', r'\1\n', cleaned)
-        cleaned = re.sub(r'<p[^>]*>(.*?)</p>', r'\1\n', cleaned)
-        cleaned = re.sub(r'<div[^>]*>(.*?)</div>', r'\1', cleaned)
-        cleaned = re.sub(r'<span[^>]*>(.*?)</span>', r'\1', cleaned)
-        
-        cleaned = re.sub(r'<[^>]+>', '', cleaned)
-        
-        cleaned = cleaned.replace('&nbsp;', ' ')
-        cleaned = cleaned.replace('&amp;', '&')
-        cleaned = cleaned.replace('&lt;', '<')
-        cleaned = cleaned.replace('&gt;', '>')
-        cleaned = cleaned.replace('&quot;', '"')
-        cleaned = cleaned.replace('&#39;', "'")
-        
-        cleaned = re.sub(r'\n\s*\n', '\n\n', cleaned)
-        
-        return cleaned.strip()
+        return sanitize_html_description(description)
 
     def _format_game_data(self, game_data):
         """Convert Steam API game data to our format"""
@@ -102,279 +168,407 @@ class SteamService:
             logger.error(f"Error formatting game data: {e}")
             return None
 
+    def _get_or_load(self, cache_key, loader, refresh=None):
+        """Serve cache_key from the cache, or load it once for all concurrent callers
+
+        Entries past their soft TTL are still returned immediately while a
+        background refresh replaces them; only a hard-expired entry blocks.
+        refresh replaces loader for that background refresh when the two
+        differ, e.g. when loader may answer from the local catalog.
+        """
+        entry = self.cache.get_entry(cache_key)
+        if entry is not None:
+            cached, fresh_until = entry
+            if fresh_until <= time.time():
+                logger.info(f"Serving stale {cache_key} while it refreshes")
+                self._schedule_refresh(cache_key, refresh or loader)
+            else:
+                logger.info(f"Cache hit for {cache_key}")
+            return cached
+        return self._inflight.do(cache_key, lambda: self._load(cache_key, loader))
+
+    def _load(self, cache_key, loader):
+        # A previous flight may have filled the entry while this caller was checking the cache
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        return self._store(cache_key, loader())
+
+    def _store(self, cache_key, data):
+        if data is not None:
+            self.cache.set(cache_key, data, self.cache_ttl, self.cache_soft_ttl)
+        return data
+
+    def _schedule_refresh(self, cache_key, loader):
+        with self._refreshing_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        self._refresh_executor.submit(self._refresh, cache_key, loader)
+
+    def _refresh(self, cache_key, loader):
+        try:
+            self._inflight.do(cache_key, lambda: self._store(cache_key, loader()))
+        except Exception as e:
+            logger.error(f"Background refresh failed for {cache_key}: {e}")
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+
+    def _get_warm_page(self, page_key, limit, offset=0):
+        """Slice the app ids of a listing page stored by the catalog warmer, if it covers the request"""
+        page = self.cache.get(page_key)
+        if page is None:
+            return None
+        app_ids = page['ids']
+        if not page['complete'] and offset + limit > len(app_ids):
+            return None
+        logger.info(f"Warm page hit for {page_key}")
+        return app_ids[offset:offset+limit]
+
     def get_top_games(self, limit=30, offset=0):
         """Get top most played games"""
+        return [game.to_dict() for game in self.get_top_game_records(limit, offset)]
+
+    def get_top_game_records(self, limit=30, offset=0):
         try:
-            cache_key = f"top_games_{limit}_{offset}"
-            current_time = time.time()
-            
-            if cache_key in self._game_cache:
-                cache_entry = self._game_cache[cache_key]
-                if current_time - cache_entry['timestamp'] < self._cache_expiry:
-                    logger.info(f"Cache hit for top_games")
-                    return cache_entry['data']
-            
-            if 'last_request' in self._last_fetch_time:
-                elapsed = current_time - self._last_fetch_time['last_request']
-                if elapsed < 0.5:
-                    time.sleep(0.5 - elapsed)
-            
-            self._last_fetch_time['last_request'] = time.time()
-            
-            url = f"{self.base_url}/ISteamChartsService/GetMostPlayedGames/v1/"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            top_games = []
-            ranks = data.get('response', {}).get('ranks', [])
-            # Support offset and limit for paging
-            for i, rank in enumerate(ranks[offset:offset+limit]):
-                app_id = rank.get('appid')
-                if app_id:
-                    game_details = self.get_game_details(app_id)
-                    if game_details:
-                        top_games.append(game_details)
-                if len(top_games) >= limit:
-                    break
-            self._game_cache[cache_key] = {
-                'data': top_games,
-                'timestamp': time.time()
-            }
-            return top_games
+            app_ids = self._get_warm_page(TOP_GAMES_PAGE, limit, offset)
+            if app_ids is None:
+                # Every limit and offset slices the same cached id list
+                app_ids = self._get_or_load("top_game_ids", self._fetch_top_game_ids)[offset:offset+limit]
+            return self.get_many_game_records(app_ids)
         except Exception as e:
             logger.error(f"Error fetching top games: {e}")
             return []
 
+    def _fetch_top_game_ids(self):
+        data = self._get_json('api', f"{self.base_url}/ISteamChartsService/GetMostPlayedGames/v1/")
+        return self._parse_top_game_ids(data)
+
+    @staticmethod
+    def _parse_top_game_ids(data):
+        ranks = data.get('response', {}).get('ranks', [])
+        return [rank.get('appid') for rank in ranks]
+
     def get_discounted_games(self, limit=10):
         """Get discounted games"""
+        return [game.to_dict() for game in self.get_discounted_game_records(limit)]
+
+    def get_discounted_game_records(self, limit=10):
         try:
-            cache_key = f"discounted_games_{limit}"
-            current_time = time.time()
-            
-            if cache_key in self._game_cache:
-                cache_entry = self._game_cache[cache_key]
-                if current_time - cache_entry['timestamp'] < self._cache_expiry:
-                    logger.info(f"Cache hit for discounted_games")
-                    return cache_entry['data']
-            
-            if 'last_request' in self._last_fetch_time:
-                elapsed = current_time - self._last_fetch_time['last_request']
-                if elapsed < 0.5:
-                    time.sleep(0.5 - elapsed)
-            
-            self._last_fetch_time['last_request'] = time.time()
-            
-            url = f"{self.store_url}/featuredcategories/?l=english"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            specials = data.get('specials', {}).get('items', [])
-            
-            discounted_games = []
-            for i, game in enumerate(specials[:limit]):
-                app_id = game.get('id')
-                if app_id:
-                    game_details = self.get_game_details(app_id)
-                    if game_details:
-                        discounted_games.append(game_details)
-                        
-                if len(discounted_games) >= limit:
-                    break
-            
-            self._game_cache[cache_key] = {
-                'data': discounted_games,
-                'timestamp': time.time()
-            }
-                    
-            return discounted_games
+            app_ids = self._get_warm_page(DISCOUNTED_GAMES_PAGE, limit)
+            if app_ids is None:
+                app_ids = self._get_or_load("discounted_game_ids", self._fetch_discounted_game_ids)[:limit]
+            return self.get_many_game_records(app_ids)
         except Exception as e:
             logger.error(f"Error fetching discounted games: {e}")
             return []
 
+    def _fetch_discounted_game_ids(self):
+        data = self._get_json('store', f"{self.store_url}/featuredcategories/", {"l": "english"})
+        return self._parse_discounted_game_ids(data)
+
+    @staticmethod
+    def _parse_discounted_game_ids(data):
+        specials = data.get('specials', {}).get('items', [])
+        return [game.get('id') for game in specials]
+
     def get_featured_games(self, limit=10):
         """Get featured games"""
+        return [game.to_dict() for game in self.get_featured_game_records(limit)]
+
+    def get_featured_game_records(self, limit=10):
         try:
-            cache_key = f"featured_games_{limit}"
-            current_time = time.time()
-            
-            if cache_key in self._game_cache:
-                cache_entry = self._game_cache[cache_key]
-                if current_time - cache_entry['timestamp'] < self._cache_expiry:
-                    logger.info(f"Cache hit for featured_games")
-                    return cache_entry['data']
-            
-            if 'last_request' in self._last_fetch_time:
-                elapsed = current_time - self._last_fetch_time['last_request']
-                if elapsed < 0.5:
-                    time.sleep(0.5 - elapsed)
-            
-            self._last_fetch_time['last_request'] = time.time()
-            
-            url = f"{self.store_url}/featured/?l=english"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            featured_games = data.get('featured_win', [])
-            
-            formatted_games = []
-            for i, game in enumerate(featured_games[:limit]):
-                app_id = game.get('id')
-                if app_id:
-                    game_details = self.get_game_details(app_id)
-                    if game_details:
-                        formatted_games.append(game_details)
-                        
-                if len(formatted_games) >= limit:
-                    break
-            
-            # Store in cache
-            self._game_cache[cache_key] = {
-                'data': formatted_games,
-                'timestamp': time.time()
-            }
-                    
-            return formatted_games
+            app_ids = self._get_warm_page(FEATURED_GAMES_PAGE, limit)
+            if app_ids is None:
+                app_ids = self._get_or_load("featured_game_ids", self._fetch_featured_game_ids)[:limit]
+            return self.get_many_game_records(app_ids)
         except Exception as e:
             logger.error(f"Error fetching featured games: {e}")
             return []
 
+    def _fetch_featured_game_ids(self):
+        data = self._get_json('store', f"{self.store_url}/featured/", {"l": "english"})
+        return self._parse_featured_game_ids(data)
+
+    @staticmethod
+    def _parse_featured_game_ids(data):
+        featured_games = data.get('featured_win', [])
+        return [game.get('id') for game in featured_games]
+
+    def warm_listings(self, top_games_size, listing_size):
+        """Refetch the homepage listings and every app in them, then store the assembled pages
+
+        Apps whose cached details are missing or stale get a full appdetails
+        fetch; the rest only have their prices refreshed in batched calls.
+        """
+        stats = {'refreshed': 0, 'errors': 0}
+        listings = [
+            (TOP_GAMES_PAGE, self._fetch_top_game_ids, top_games_size),
+            (DISCOUNTED_GAMES_PAGE, self._fetch_discounted_game_ids, listing_size),
+            (FEATURED_GAMES_PAGE, self._fetch_featured_game_ids, listing_size),
+        ]
+        executor = self._get_executor(self.max_workers)
+        for page_key, fetch_ids, size in listings:
+            try:
+                all_ids = [app_id for app_id in fetch_ids() if app_id]
+            except Exception as e:
+                logger.error(f"Warmer failed to fetch {page_key}: {e}")
+                stats['errors'] += 1
+                continue
+            app_ids = list(dict.fromkeys(all_ids[:size]))
+            entries = self.cache.get_many_entries([str(app_id) for app_id in app_ids])
+            now = time.time()
+            details = {}
+            fresh_ids = []
+            stale_ids = []
+            for app_id in app_ids:
+                entry = entries.get(str(app_id))
+                if entry is not None and entry[1] > now:
+                    details[app_id] = entry[0]
+                    fresh_ids.append(app_id)
+                else:
+                    stale_ids.append(app_id)
+            details.update(zip(stale_ids, executor.map(self._refresh_game_details, stale_ids)))
+            details.update(self.refresh_prices(fresh_ids))
+
+            page_ids = []
+            for app_id in app_ids:
+                if details.get(app_id):
+                    page_ids.append(app_id)
+                    stats['refreshed'] += 1
+                else:
+                    stats['errors'] += 1
+            # Pages only reference the apps; their details stay in the per-app entries
+            page = {'ids': page_ids, 'complete': len(all_ids) <= size}
+            self.cache.set(page_key, page, self.cache_ttl)
+        return stats
+
+    def _refresh_game_details(self, app_id):
+        cache_key = str(app_id)
+        try:
+            return self._inflight.do(cache_key, lambda: self._store(cache_key, self._fetch_game_details(app_id)))
+        except Exception as e:
+            logger.error(f"Warmer failed to refresh app_id {app_id}: {e}")
+            return None
+
     def get_game_details(self, app_id):
         """Get detailed information for a specific game"""
+        game = self.get_game_record(app_id)
+        return game.to_dict() if game else None
+
+    def get_game_record(self, app_id):
         try:
             cache_key = str(app_id)
-            current_time = time.time()
-            
-            if cache_key in self._game_cache:
-                cache_entry = self._game_cache[cache_key]
-                if current_time - cache_entry['timestamp'] < self._cache_expiry:
-                    logger.info(f"Cache hit for app_id: {app_id}")
-                    return cache_entry['data']
-            
-            if 'last_request' in self._last_fetch_time:
-                elapsed = current_time - self._last_fetch_time['last_request']
-                if elapsed < 0.5:  # 500ms
-                    time.sleep(0.5 - elapsed)
-            
-            self._last_fetch_time['last_request'] = time.time()
-            
-            # Always add l=english to the appdetails URL
-            url = f"{self.store_url}/appdetails?appids={app_id}&l=english"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data and data.get(str(app_id), {}).get('success'):
-                game_data = data.get(str(app_id), {}).get('data', {})
-                formatted_data = self._format_game_data(game_data)
-                
-                if formatted_data:
-                    self._game_cache[cache_key] = {
-                        'data': formatted_data,
-                        'timestamp': time.time()
-                    }
-                
-                return formatted_data
-            return None
+            return GameRecord.load(self._get_or_load(
+                cache_key,
+                lambda: self._load_game_details(app_id),
+                lambda: self._fetch_game_details(app_id),
+            ))
         except Exception as e:
             logger.error(f"Error fetching game details for app_id {app_id}: {e}")
             return None
 
+    def get_many_game_details(self, app_ids):
+        """Get details for several apps, keeping their order and sending only cache misses upstream"""
+        return [game.to_dict() for game in self.get_many_game_records(app_ids)]
+
+    def get_many_game_records(self, app_ids):
+        app_ids = [app_id for app_id in app_ids if app_id]
+        if not app_ids:
+            return []
+        entries = self.cache.get_many_entries([str(app_id) for app_id in app_ids])
+        now = time.time()
+        details = {}
+        missing = []
+        for app_id in dict.fromkeys(app_ids):
+            cache_key = str(app_id)
+            entry = entries.get(cache_key)
+            if entry is None:
+                missing.append(app_id)
+                continue
+            details[app_id] = GameRecord.load(entry[0])
+            if entry[1] <= now:
+                self._schedule_refresh(cache_key, lambda app_id=app_id: self._fetch_game_details(app_id))
+        if missing:
+            logger.info(f"Resolving {len(missing)} of {len(app_ids)} apps upstream")
+            executor = self._get_executor(self.max_workers)
+            details.update(zip(missing, executor.map(self.get_game_record, missing)))
+        return [details[app_id] for app_id in app_ids if details.get(app_id)]
+
+    def refresh_prices(self, app_ids):
+        """Refresh the price of already cached apps with batched price_overview lookups
+
+        appdetails only accepts several appids together with
+        filters=price_overview, so this is the cheap path for apps whose
+        full details are still fresh. Returns {app_id: updated GameRecord}.
+        """
+        updated = {}
+        app_ids = list(dict.fromkeys(app_id for app_id in app_ids if app_id))
+        for start in range(0, len(app_ids), self.price_batch_size):
+            batch = app_ids[start:start+self.price_batch_size]
+            try:
+                prices = self._fetch_prices(batch)
+            except Exception as e:
+                logger.error(f"Error refreshing prices for {len(batch)} apps: {e}")
+                continue
+            entries = self.cache.get_many_entries([str(app_id) for app_id in prices])
+            for app_id, price in prices.items():
+                entry = entries.get(str(app_id))
+                if entry is None:
+                    continue
+                game = GameRecord.load(entry[0])._replace(price=price)
+                self.cache.set(str(app_id), game, self.cache_ttl, max(entry[1] - time.time(), 0))
+                updated[app_id] = game
+            self._persist_prices(prices)
+        return updated
+
+    def _fetch_prices(self, app_ids):
+        params = {"appids": ",".join(str(app_id) for app_id in app_ids), "filters": "price_overview", "cc": "US"}
+        data = self._get_json('store', f"{self.store_url}/appdetails", params) or {}
+
+        prices = {}
+        for app_id in app_ids:
+            result = data.get(str(app_id)) or {}
+            if not result.get('success'):
+                continue
+            app_data = result.get('data')
+            # Free apps come back with an empty list instead of a price_overview object
+            price_overview = app_data.get('price_overview') if isinstance(app_data, dict) else None
+            price = float(price_overview.get('final', 0)) / 100 if price_overview else 0.00
+            prices[app_id] = str(price)
+        return prices
+
+    def _persist_prices(self, prices):
+        with self.app.app_context():
+            try:
+                GameRepository.update_steam_prices(prices)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error saving {len(prices)} prices to the catalog: {e}")
+
+    def _load_game_details(self, app_id):
+        """Read an app from the local catalog, going upstream only when its row is stale
+
+        Only cold misses come through here; refreshes of entries past their
+        soft TTL go straight to _fetch_game_details, since the catalog row
+        outlives the soft TTL and would hand back the same stale copy.
+        """
+        game = self._read_catalog_game(app_id)
+        if game is not None:
+            return game
+        return self._fetch_game_details(app_id)
+
+    def _read_catalog_game(self, app_id):
+        with self.app.app_context():
+            game = GameRepository.get_by_steam_appid(app_id)
+            if game and game.fetched_at:
+                fetched_at = game.fetched_at
+                if fetched_at.tzinfo is None:
+                    fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+                if datetime.now(timezone.utc) - fetched_at < timedelta(seconds=self.catalog_ttl):
+                    logger.info(f"Catalog hit for app_id: {app_id}")
+                    return GameRecord.from_dict(game.serialize_steam_app())
+        return None
+
+    def _fetch_game_details(self, app_id):
+        # Always add l=english to the appdetails URL
+        data = self._get_json('store', f"{self.store_url}/appdetails", {"appids": app_id, "l": "english"})
+        formatted_data = self._parse_game_details(app_id, data)
+        if formatted_data and formatted_data.get('id'):
+            self._persist_game(formatted_data)
+        return GameRecord.from_dict(formatted_data) if formatted_data else None
+
+    def _parse_game_details(self, app_id, data):
+        if data and data.get(str(app_id), {}).get('success'):
+            game_data = data.get(str(app_id), {}).get('data', {})
+            return self._format_game_data(game_data)
+        return None
+
+    def _persist_game(self, formatted_data):
+        # Detail fetches run on pool threads, so the catalog write needs its own app context
+        with self.app.app_context():
+            try:
+                GameRepository.upsert_steam_game(formatted_data)
+                self.app.extensions['steam_suggest_index'].add_game(formatted_data)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error saving app_id {formatted_data.get('id')} to the catalog: {e}")
+
     def search_games(self, query, limit=20):
-        """Search for games by name"""
+        """Search for games by name, from the local catalog index when it has enough matches"""
         try:
-            cache_key = f"search_{query}_{limit}"
-            current_time = time.time()
-            
-            if cache_key in self._game_cache:
-                cache_entry = self._game_cache[cache_key]
-                if current_time - cache_entry['timestamp'] < self._cache_expiry:
-                    logger.info(f"Cache hit for search_games: {query}")
-                    return cache_entry['data']
-            
-            if 'last_request' in self._last_fetch_time:
-                elapsed = current_time - self._last_fetch_time['last_request']
-                if elapsed < 0.5:
-                    time.sleep(0.5 - elapsed)
-            
-            self._last_fetch_time['last_request'] = time.time()
-            
-            url = f"https://store.steampowered.com/api/storesearch/?term={query}&l=english&cc=US"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            search_results = []
-            if data and 'items' in data:
-                # Get the first 'limit' results
-                for i, item in enumerate(data['items'][:limit]):
-                    app_id = item.get('id')
-                    if app_id:
-                        # Get detailed info for each game
-                        game_details = self.get_game_details(app_id)
-                        if game_details:
-                            search_results.append(game_details)
-                    
-                    if len(search_results) >= limit:
-                        break
-            
-            # Store in cache
-            self._game_cache[cache_key] = {
-                'data': search_results,
-                'timestamp': time.time()
-            }
-                
-            return search_results
+            # Steam and the catalog get the query as typed; only the cache key is folded, so
+            # "Portal", "portal " and "PORTAL" share one entry whatever the limit
+            term = clean_query(query)
+            if not term:
+                return []
+            cache_key = f"search_{normalize_text(term) or term}"
+            # Queries Steam already answered stay on their cached result until it expires
+            if self.cache.get_entry(cache_key) is None:
+                games = self._search_catalog(term, limit)
+                if games is not None:
+                    return games
+            app_ids = self._get_or_load(cache_key, lambda: self._fetch_search_ids(term))
+            return self.get_many_game_details(app_ids[:limit])
         except Exception as e:
             logger.error(f"Error searching games with query '{query}': {e}")
             return []
 
+    def _search_catalog(self, query, limit):
+        """Answer a search from the catalog's full-text index, or None to defer to Steam"""
+        with self.app.app_context():
+            try:
+                games = GameRepository.search_steam_games(query, limit)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Catalog search failed for '{query}': {e}")
+                return None
+            if len(games) < min(limit, self.search_min_hits):
+                return None
+            logger.info(f"Catalog search hit for '{query}'")
+            return [game.serialize_steam_app() for game in games]
+
+    def _fetch_search_ids(self, term):
+        # Only the ids are cached; details come from each app's own entry
+        data = self._get_json('store', f"{self.store_url}/storesearch/", {"term": term, "l": "english", "cc": "US"})
+        return self._parse_search_ids(data)[:SEARCH_RESULTS_LIMIT]
+
+    @staticmethod
+    def _parse_search_ids(data):
+        if data and 'items' in data:
+            return [item['id'] for item in data['items'] if item.get('id')]
+        return []
+
     def get_game_news(self, app_id, count=5, maxlength=500):
         """Fetch news for a specific game from Steam API"""
         try:
             cache_key = f"news_{app_id}_{count}_{maxlength}"
-            current_time = time.time()
-            if cache_key in self._game_cache:
-                cache_entry = self._game_cache[cache_key]
-                if current_time - cache_entry['timestamp'] < self._cache_expiry:
-                    logger.info(f"Cache hit for news: {app_id}")
-                    return cache_entry['data']
-
-            if 'last_request' in self._last_fetch_time:
-                elapsed = current_time - self._last_fetch_time['last_request']
-                if elapsed < 0.5:
-                    time.sleep(0.5 - elapsed)
-            self._last_fetch_time['last_request'] = time.time()
-
-            url = f"{self.base_url}/ISteamNews/GetNewsForApp/v0002/"
-            params = {
-                "appid": app_id,
-                "count": count,
-                "maxlength": maxlength,
-                "format": "json"
-            }
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            news_items = data.get("appnews", {}).get("newsitems", [])
-
-            formatted_news = [
-                {
-                    "title": item.get("title"),
-                    "date": datetime.utcfromtimestamp(item.get("date")).strftime("%Y-%m-%d"),
-                    "summary": item.get("contents"),
-                    "url": item.get("url")
-                }
-                for item in news_items
-            ]
-
-            self._game_cache[cache_key] = {
-                "data": formatted_news,
-                "timestamp": time.time()
-            }
-            return formatted_news
+            return self._get_or_load(cache_key, lambda: self._fetch_game_news(app_id, count, maxlength))
         except Exception as e:
             logger.error(f"Error fetching news for app_id {app_id}: {e}")
             return []
+
+    def _fetch_game_news(self, app_id, count, maxlength):
+        url = f"{self.base_url}/ISteamNews/GetNewsForApp/v0002/"
+        params = {
+            "appid": app_id,
+            "count": count,
+            "maxlength": maxlength,
+            "format": "json"
+        }
+        return self._parse_game_news(self._get_json('api', url, params))
+
+    @staticmethod
+    def _parse_game_news(data):
+        news_items = data.get("appnews", {}).get("newsitems", [])
+
+        return [
+            {
+                "title": item.get("title"),
+                "date": datetime.utcfromtimestamp(item.get("date")).strftime("%Y-%m-%d"),
+                "summary": item.get("contents"),
+                "url": item.get("url")
+            }
+            for item in news_items
+        ]
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from flask import current_app
+from app.repositories.game_repository import GameRepository
+from app.services.steam_service import GameRecord, TOP_GAMES_PAGE, DISCOUNTED_GAMES_PAGE, FEATURED_GAMES_PAGE
+from app.utils.prefix_index import PrefixIndex
+
+logger = logging.getLogger(__name__)
+
+# Most-played apps outrank everything else; rating orders the rest
+RANK_WEIGHT = 1000
+
+
+def popularity(rating, rank=None):
+    rank_score = RANK_WEIGHT - rank if rank is not None and rank < RANK_WEIGHT else 0
+    return rank_score + (rating or 0)
+
+
+class CatalogSuggestions:
+    """Process-local prefix index over Steam catalog titles
+
+    Built on first use from the `games` table and the cached listing
+    pages, then topped up with rows fetched since the last sync (at most
+    once per sync_interval, so apps ingested by other workers show up
+    too). Apps this process ingests are added as soon as they are saved.
+    """
+
+    def __init__(self, sync_interval):
+        self.index = PrefixIndex()
+        self.sync_interval = sync_interval
+        self._synced_until = None
+        self._checked_at = None
+        self._ranks = {}
+        self._lock = threading.Lock()
+
+    def add_game(self, game_data, rank=None):
+        if game_data.get('id') and game_data.get('title'):
+            if rank is None:
+                # Detail fetches don't know the app's chart position; keep the one from the last sync
+                rank = self._ranks.get(game_data['id'])
+            self.index.add(game_data['id'], game_data['title'], popularity(game_data.get('rating'), rank))
+
+    def suggest(self, query, limit):
+        self._sync_if_due()
+        return self.index.search(query, limit)
+
+    def _sync_if_due(self):
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.sync_interval:
+            return
+        with self._lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self.sync_interval:
+                return
+            try:
+                self._sync()
+            except Exception as e:
+                logger.error(f"Suggestion index sync failed: {e}")
+            self._checked_at = time.monotonic()
+
+    def _sync(self):
+        cache = current_app.extensions['steam_cache']
+        top_page = cache.get(TOP_GAMES_PAGE)
+        ranks = {app_id: rank for rank, app_id in enumerate(top_page['ids'])} if top_page else {}
+        self._ranks = ranks
+
+        rows = GameRepository.list_steam_titles(since=self._synced_until)
+        for app_id, title, rating, fetched_at in rows:
+            self.index.add(app_id, title, popularity(rating, ranks.get(app_id)))
+            if fetched_at is not None:
+                self._synced_until = fetched_at
+
+        if self._checked_at is None:
+            # Listing pages can hold apps whose catalog write failed
+            for page_key in (TOP_GAMES_PAGE, DISCOUNTED_GAMES_PAGE, FEATURED_GAMES_PAGE):
+                page = cache.get(page_key)
+                missing = [app_id for app_id in (page['ids'] if page else []) if app_id not in self.index]
+                for value, _ in cache.get_many_entries([str(app_id) for app_id in missing]).values():
+                    game = GameRecord.load(value)
+                    self.add_game(game.to_dict(), ranks.get(game.id))
+            logger.info(f"Built suggestion index with {len(self.index)} titles")
+
+
+class SuggestService:
+    def __init__(self):
+        self.suggestions = current_app.extensions['steam_suggest_index']
+
+    def suggest(self, query, limit=8):
+        """Catalog titles with a word starting with query, most popular first"""
+        return [{"id": app_id, "title": title} for app_id, title in self.suggestions.suggest(query, limit)]
+
+
+def init_suggest_index(app):
+    app.extensions['steam_suggest_index'] = CatalogSuggestions(app.config['STEAM_SUGGEST_SYNC_INTERVAL'])
+    return app.extensions['steam_suggest_index']
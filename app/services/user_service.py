@@ -1,7 +1,9 @@
 from typing import Optional, Dict, Any
 from app.repositories.user_repository import UserRepository
+from app.services.admin import AdminService
 from app.models.user import User
 from app.extensions import db
+from app.utils.identity import get_identity
 from app.utils.validators import is_valid_email, is_valid_username
 from werkzeug.security import generate_password_hash
 
@@ -11,7 +13,7 @@ class UserService:
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[User]:
         """Get user by ID"""
-        return UserRepository.get_by_id(user_id)
+        return get_identity(user_id)
     
     @staticmethod
     def get_user_by_username(username: str) -> Optional[User]:
@@ -26,7 +28,7 @@ class UserService:
     @staticmethod
     def update_user(user_id: int, user_data: Dict[str, Any]) -> User:
         """Update user information"""
-        user = UserRepository.get_by_id(user_id)
+        user = get_identity(user_id)
         if not user:
             raise ValueError(f"User not found with id {user_id}")
         
@@ -76,6 +78,7 @@ class UserService:
         try:
             updated_user = UserRepository.update_user(user_id, **update_data)
             db.session.commit()
+            AdminService.invalidate_roles(user_id)
             return updated_user
         except Exception as e:
             db.session.rollback()
@@ -87,6 +90,7 @@ class UserService:
         try:
             user = UserRepository.update_user(user_id, is_active=False)
             db.session.commit()
+            AdminService.invalidate_roles(user_id)
             return user
         except Exception as e:
             db.session.rollback()
@@ -98,12 +102,20 @@ class UserService:
         try:
             user = UserRepository.update_user(user_id, is_active=True)
             db.session.commit()
+            AdminService.invalidate_roles(user_id)
             return user
         except Exception as e:
             db.session.rollback()
             raise e
     
+    @staticmethod
+    def get_user_version(user: User) -> tuple:
+        """What the user's serialized form depends on; profiles carry no timestamp, so their columns count"""
+        profile = user.profile
+        profile_values = [getattr(profile, column.key) for column in profile.__table__.columns] if profile else None
+        return user.updated_at, user.is_active, user.is_admin, profile_values
+
     @staticmethod
     def get_user_with_profile(user_id: int) -> Optional[User]:
         """Get user with profile information"""
-        return UserRepository.get_user_with_profile(user_id)
+        return get_identity(user_id)
@@ -6,8 +6,17 @@ from sqlalchemy import select
 
 class WishlistService:
     @staticmethod
-    def get_user_wishlist(user_id: int):
-        return WishlistItemRepository.get_user_wishlist(user_id)
+    def get_user_wishlist(user_id: int, limit: int, after=None, descending: bool = True):
+        """One page of a user's wishlist and the (created_at, id) key of its last row, or None on the last page"""
+        rows = WishlistItemRepository.get_user_wishlist(user_id, limit, after, descending)
+        page = rows[:limit]
+        next_key = (page[-1].created_at, page[-1].wishlist_id) if len(rows) > limit else None
+        return page, next_key
+    
+    @staticmethod
+    def get_user_wishlist_page_version(user_id: int, limit: int, after=None, descending: bool = True):
+        rows = WishlistItemRepository.get_user_wishlist_page_version(user_id, limit, after, descending)
+        return rows[:limit], len(rows) > limit
     
     @staticmethod
     def get_wishlist_item(user_id: int, game_id: int):
@@ -32,12 +41,12 @@ class WishlistService:
         return WishlistItemRepository.delete_from_wishlist(user_id, game_id)
     
     @staticmethod
-    def format_wishlist_response(wishlist_items):
+    def format_wishlist_response(wishlist_rows):
         formatted_items = []
-        for item in wishlist_items:
+        for row in wishlist_rows:
             formatted_items.append({
-                "wishlist_id": item.id,
-                "created_at": item.created_at,
-                "game": item.game.serialize() if item.game else None
+                "wishlist_id": row.wishlist_id,
+                "created_at": row.created_at,
+                "game": Game.serialize_row(row)
             })
         return formatted_items
\ No newline at end of file
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import random
+import threading
+import httpx
+from app.utils.http_client import RETRY_STATUSES
+
+
+class AsyncHttpClient:
+    """httpx client on one background event loop shared by every async view in a worker process
+
+    Flask runs each async view on a short-lived loop of its own, while a
+    pooled httpx client is bound to the loop it was created on. Requests are
+    therefore handed to a long-lived loop thread and awaited from the view's loop.
+    """
+
+    def __init__(self, connect_timeout=3.05, read_timeout=10, retries=3, backoff=0.3,
+                 max_connections=100, max_keepalive=16):
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self.retries = retries
+        self.backoff = backoff
+        self._loop = None
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        # The loop thread does not survive a fork, so each process starts its own
+        if self._loop is None or self._pid != os.getpid():
+            with self._lock:
+                if self._loop is None or self._pid != os.getpid():
+                    self._loop = asyncio.new_event_loop()
+                    self._client = None
+                    self._pid = os.getpid()
+                    threading.Thread(target=self._loop.run_forever, name="steam-async-http", daemon=True).start()
+        return self._loop
+
+    async def get(self, url, params=None):
+        future = asyncio.run_coroutine_threadsafe(self._get(url, params), self.loop)
+        return await asyncio.wrap_future(future)
+
+    async def _get(self, url, params):
+        # Only ever runs on the loop thread, so the client needs no lock
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.get(url, params=params)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+            # Same jittered exponential backoff as the sync client's urllib3 Retry
+            await asyncio.sleep(self.backoff * (2 ** attempt) + random.uniform(0, self.backoff))
+            attempt += 1
+
+
+def init_async_http_client(app):
+    app.extensions["async_http_client"] = AsyncHttpClient(
+        connect_timeout=app.config["STEAM_HTTP_CONNECT_TIMEOUT"],
+        read_timeout=app.config["STEAM_HTTP_READ_TIMEOUT"],
+        retries=app.config["STEAM_HTTP_RETRIES"],
+        backoff=app.config["STEAM_HTTP_BACKOFF"],
+        max_connections=app.config["STEAM_ASYNC_MAX_CONNECTIONS"],
+        max_keepalive=app.config["STEAM_HTTP_POOL_SIZE"],
+    )
+    return app.extensions["async_http_client"]
@@ -0,0 +1,295 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def _sizeof(value):
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+def _digest(payload):
+    return int.from_bytes(hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+class MemoryCache:
+    """Process-local LRU cache bounded by entry count and payload bytes
+
+    Entries are fresh until their soft TTL, then stale but still served
+    until the hard TTL expires them. Every write stamps the entry with a
+    new version number.
+    """
+
+    def __init__(self, max_entries=5000, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key):
+        """Return (value, fresh_until) for a live entry, stale or not"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, fresh_until, expires_at, size, _ = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value, fresh_until
+
+    def get_many_entries(self, keys):
+        """Return {key: (value, fresh_until)} for every live entry among keys"""
+        entries = {}
+        for key in keys:
+            entry = self.get_entry(key)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    def get_many_versions(self, keys):
+        """Return {key: (version, fresh_until)} for every live entry among keys, without their values"""
+        versions = {}
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[2] > now:
+                    self._entries.move_to_end(key)
+                    versions[key] = (entry[4], entry[1])
+        return versions
+
+    def set(self, key, value, ttl, soft_ttl=None):
+        size = _sizeof(value) if self.max_bytes else 0
+        now = time.time()
+        fresh_until = now + (soft_ttl if soft_ttl is not None else ttl)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+            self._entries[key] = (value, fresh_until, now + ttl, size, next(self._versions))
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[3]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, _, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+
+class SQLiteCache:
+    """LRU cache kept in a SQLite file so every worker on the host shares it
+
+    Each entry's version is a digest of its stored JSON, so every worker
+    reads the same version for the same value without decoding it.
+    """
+
+    # Reads only refresh the LRU position once per interval to avoid a write per hit
+    touch_interval = 30
+    # Eviction trims to this share of the limits, so a full cache is not re-ranked on every write
+    evict_to = 0.9
+    schema_version = 5
+
+    def __init__(self, path, max_entries=5000, max_bytes=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        conn = self._connect()
+        # The file only holds cached data, so an outdated layout is dropped rather than migrated
+        if conn.execute("PRAGMA user_version").fetchone()[0] != self.schema_version:
+            conn.execute("DROP TABLE IF EXISTS cache")
+            conn.execute("DROP TABLE IF EXISTS cache_stats")
+            conn.execute(f"PRAGMA user_version = {self.schema_version}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, fresh_until REAL NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL, version INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_accessed_at ON cache (accessed_at)")
+        # Running totals kept by triggers, so every worker sharing the file sees the same sizes
+        # without summing the table on each write
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_stats ("
+            "id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)"
+        )
+        conn.execute("INSERT OR IGNORE INTO cache_stats (id, entries, bytes) VALUES (0, 0, 0)")
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS cache_stats_ai AFTER INSERT ON cache BEGIN "
+            "UPDATE cache_stats SET entries = entries + 1, bytes = bytes + new.size; END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS cache_stats_ad AFTER DELETE ON cache BEGIN "
+            "UPDATE cache_stats SET entries = entries - 1, bytes = bytes - old.size; END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS cache_stats_au AFTER UPDATE OF size ON cache BEGIN "
+            "UPDATE cache_stats SET bytes = bytes - old.size + new.size; END"
+        )
+
+    def _connect(self):
+        # Connections are per thread and per process; a forked worker must not reuse its parent's
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key):
+        """Return (value, fresh_until) for a live entry, stale or not"""
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, fresh_until, expires_at, accessed_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, fresh_until, expires_at, accessed_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            if now - accessed_at > self.touch_interval:
+                conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(value), fresh_until
+        except sqlite3.Error as e:
+            logger.error(f"Cache read failed for {key}: {e}")
+            return None
+
+    def get_many_entries(self, keys):
+        """Return {key: (value, fresh_until)} for every live entry among keys, in one query"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = time.time()
+        placeholders = ", ".join("?" * len(keys))
+        try:
+            conn = self._connect()
+            rows = conn.execute(
+                f"SELECT key, value, fresh_until FROM cache WHERE key IN ({placeholders}) AND expires_at > ?",
+                (*keys, now),
+            ).fetchall()
+            conn.execute(
+                f"UPDATE cache SET accessed_at = ? WHERE key IN ({placeholders}) AND accessed_at < ?",
+                (now, *keys, now - self.touch_interval),
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Cache read failed for {len(keys)} keys: {e}")
+            return {}
+        return {key: (json.loads(value), fresh_until) for key, value, fresh_until in rows}
+
+    def get_many_versions(self, keys):
+        """Return {key: (version, fresh_until)} for every live entry among keys, without reading their values"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = time.time()
+        placeholders = ", ".join("?" * len(keys))
+        try:
+            conn = self._connect()
+            rows = conn.execute(
+                f"SELECT key, version, fresh_until FROM cache WHERE key IN ({placeholders}) AND expires_at > ?",
+                (*keys, now),
+            ).fetchall()
+            conn.execute(
+                f"UPDATE cache SET accessed_at = ? WHERE key IN ({placeholders}) AND accessed_at < ?",
+                (now, *keys, now - self.touch_interval),
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Cache read failed for {len(keys)} keys: {e}")
+            return {}
+        return {key: (version, fresh_until) for key, version, fresh_until in rows}
+
+    def set(self, key, value, ttl, soft_ttl=None):
+        now = time.time()
+        fresh_until = now + (soft_ttl if soft_ttl is not None else ttl)
+        payload = json.dumps(value, default=str)
+        try:
+            conn = self._connect()
+            # An upsert rather than INSERT OR REPLACE: REPLACE's implicit delete skips the stats triggers
+            conn.execute(
+                "INSERT INTO cache (key, value, fresh_until, expires_at, accessed_at, size, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                "fresh_until = excluded.fresh_until, expires_at = excluded.expires_at, "
+                "accessed_at = excluded.accessed_at, size = excluded.size, version = excluded.version",
+                (key, payload, fresh_until, now + ttl, now, len(payload), _digest(payload)),
+            )
+            self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.error(f"Cache write failed for {key}: {e}")
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+    def _evict(self, conn, now):
+        count, total = conn.execute("SELECT entries, bytes FROM cache_stats").fetchone()
+        if count <= self.max_entries and not (self.max_bytes and total > self.max_bytes):
+            return
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        keep_entries = int(self.max_entries * self.evict_to)
+        keep_bytes = int(self.max_bytes * self.evict_to) if self.max_bytes else None
+        # One pass from the most recently used down: everything past the entry or byte budget goes
+        conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM (SELECT key, ROW_NUMBER() OVER recent AS position, SUM(size) OVER recent AS kept "
+            "FROM cache WINDOW recent AS (ORDER BY accessed_at DESC, key ROWS UNBOUNDED PRECEDING)) "
+            "WHERE position > ? OR kept > COALESCE(?, kept))",
+            (keep_entries, keep_bytes),
+        )
+
+
+def create_cache(config, instance_path):
+    backend = config["STEAM_CACHE_BACKEND"]
+    max_entries = config["STEAM_CACHE_MAX_ENTRIES"]
+    max_bytes = config["STEAM_CACHE_MAX_BYTES"]
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+    if backend == "sqlite":
+        path = config["STEAM_CACHE_PATH"] or os.path.join(instance_path, "steam_cache.sqlite3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return SQLiteCache(path, max_entries=max_entries, max_bytes=max_bytes)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def init_cache(app):
+    app.extensions["steam_cache"] = create_cache(app.config, app.instance_path)
+    return app.extensions["steam_cache"]
@@ -0,0 +1,148 @@
+import gzip
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from flask import g, request
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered
+    brotli = None
+
+# Preferred first when the client rates them equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSORS = {"gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0)}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/javascript", "text/html", "text/plain", "text/css", "text/csv"}
+
+# Compressed representations carry their own ETag, e.g. "abc-gzip"
+_ETAG_SUFFIX_RE = re.compile(r'-(gzip|br)"')
+
+
+def negotiate_encoding():
+    """Best content coding the request accepts among the ones this server can produce, or None"""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compressible(response, min_size):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or "Content-Encoding" in response.headers:
+        return False
+    if response.status_code != 200 or request.method == "HEAD":
+        return False
+    return response.is_streamed or response.calculate_content_length() >= min_size
+
+
+def apply_encoding(response, encoding, body):
+    """Replace response's body with its `encoding` representation"""
+    response.set_data(body)
+    return _mark_encoded(response, encoding)
+
+
+def _mark_encoded(response, encoding):
+    # The encoded bytes are a different representation, so they get their own ETag
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+def _stream_gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _stream_brotli(chunks):
+    compressor = brotli.Compressor(quality=5)
+    for chunk in chunks:
+        data = compressor.process(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressedBodies:
+    """LRU of compressed bodies keyed by (ETag, encoding), so an unchanged response is compressed once"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, etag, encoding, body):
+        key = (etag, encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                return compressed
+        compressed = COMPRESSORS[encoding](body)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compressed
+                self._bytes += len(compressed)
+            while self._entries and self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return compressed
+
+
+def init_compression(app):
+    """Negotiate gzip/brotli for compressible responses of at least COMPRESS_MIN_SIZE bytes
+
+    Register before init_conditional_get: after_request hooks run in
+    reverse order, so validators are checked against the uncompressed body
+    first and a 304 is never compressed.
+    """
+    min_size = app.config["COMPRESS_MIN_SIZE"]
+    bodies = CompressedBodies(app.config["COMPRESS_CACHE_MAX_BYTES"])
+    app.extensions["compressed_bodies"] = bodies
+
+    @app.before_request
+    def strip_encoding_from_validators():
+        # A client revalidating a compressed copy sends back the suffixed ETag
+        if_none_match = request.environ.get("HTTP_IF_NONE_MATCH")
+        if if_none_match and "-" in if_none_match:
+            g.validated_encodings = set(_ETAG_SUFFIX_RE.findall(if_none_match))
+            request.environ["HTTP_IF_NONE_MATCH"] = _ETAG_SUFFIX_RE.sub('"', if_none_match)
+
+    @app.after_request
+    def compress_response(response):
+        if response.mimetype in COMPRESSIBLE_MIMETYPES:
+            response.vary.add("Accept-Encoding")
+        if response.status_code == 304:
+            # The 304 names the representation the client holds, so it keeps that copy's suffix
+            encoding = negotiate_encoding()
+            if encoding in g.get("validated_encodings", ()):
+                etag, weak = response.get_etag()
+                if etag:
+                    response.set_etag(f"{etag}-{encoding}", weak)
+            return response
+        if not compressible(response, min_size):
+            return response
+        encoding = negotiate_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            stream = _stream_brotli if encoding == "br" else _stream_gzip
+            response.response = stream(response.response)
+            response.headers.pop("Content-Length", None)
+            return _mark_encoded(response, encoding)
+
+        etag, weak = response.get_etag()
+        body = response.get_data()
+        if etag and not weak:
+            compressed = bodies.get_or_compress(etag, encoding, body)
+        else:
+            compressed = COMPRESSORS[encoding](body)
+        return apply_encoding(response, encoding, compressed)
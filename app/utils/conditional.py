@@ -0,0 +1,36 @@
+import hashlib
+from flask import current_app, request
+from werkzeug.http import is_resource_modified
+
+
+def make_etag(*parts):
+    """Strong ETag over whatever versions a response is built from"""
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def conditional_response(etag, build, last_modified=None):
+    """Answer 304 when the client's validators still match, calling build() for the body only otherwise
+
+    build returns anything a view may return. Validators are only attached
+    to a successful response.
+    """
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.make_response(build())
+    if response.status_code in (200, 304):
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+    return response
+
+
+def init_conditional_get(app):
+    @app.after_request
+    def add_validators(response):
+        # Views that know their data version set the ETag themselves; the rest get one hashed from the body
+        if request.method not in ("GET", "HEAD") or response.status_code != 200 or response.is_streamed:
+            return response
+        if "ETag" not in response.headers:
+            response.add_etag()
+        return response.make_conditional(request)
@@ -0,0 +1,34 @@
+import html
+import re
+
+# One tokenizer for every tag. Splitting on it leaves the text between tags at even
+# indexes and the tag name (with a leading "/" for closing tags) at odd indexes.
+_TAG_RE = re.compile(r"<(/?[a-zA-Z][a-zA-Z0-9]*)[^>]*>|<[^>]*>")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
+_TAG_REPLACEMENTS = {
+    "br": "\n",
+    "ul": "\n",
+    "/ul": "\n",
+    "li": "• ",
+    "/li": "\n",
+    "/p": "\n",
+    "/h1": "\n",
+    "/h2": "\n",
+    "/h3": "\n",
+    "/h4": "\n",
+    "/h5": "\n",
+    "/h6": "\n",
+}
+
+
+def sanitize_html_description(description):
+    """Turn a Steam HTML description into plain text with line breaks and bullets"""
+    if not description:
+        return ""
+    parts = _TAG_RE.split(description)
+    # Every other tag (and malformed "<...>" runs, which have no name) is dropped
+    parts[1::2] = [_TAG_REPLACEMENTS.get(tag.lower(), "") if tag else "" for tag in parts[1::2]]
+    cleaned = html.unescape("".join(parts)).replace("\xa0", " ")
+    cleaned = _BLANK_LINES_RE.sub("\n\n", cleaned)
+    return cleaned.strip()
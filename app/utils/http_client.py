@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 429 is not retried here: a throttled request is retried by the caller, through its rate limit budget
+RETRY_STATUSES = (500, 502, 503, 504)
+TOO_MANY_REQUESTS = 429
+
+
+def retry_after(response, default):
+    """Seconds a 429 response asks the client to wait, from its Retry-After header or default"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+
+class HttpClient:
+    """Keep-alive HTTP client shared by every request a worker process makes upstream"""
+
+    def __init__(self, connect_timeout=3.05, read_timeout=10, retries=3, backoff=0.3, pool_size=16):
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Pooled sockets must not be shared with a forked worker, so each process builds its own session
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    self._session = self._create_session()
+                    self._pid = os.getpid()
+        return self._session
+
+    def _create_session(self):
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            backoff_jitter=self.backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            # A long Retry-After on a 503 would hold the worker; jittered backoff keeps waits bounded
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        # pool_block caps concurrent connections per host at pool_size instead of opening extras
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, pool_block=True, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get(self, url, params=None):
+        return self.session.get(url, params=params, timeout=self.timeout)
+
+
+def init_http_client(app):
+    app.extensions["http_client"] = HttpClient(
+        connect_timeout=app.config["STEAM_HTTP_CONNECT_TIMEOUT"],
+        read_timeout=app.config["STEAM_HTTP_READ_TIMEOUT"],
+        retries=app.config["STEAM_HTTP_RETRIES"],
+        backoff=app.config["STEAM_HTTP_BACKOFF"],
+        pool_size=app.config["STEAM_HTTP_POOL_SIZE"],
+    )
+    return app.extensions["http_client"]
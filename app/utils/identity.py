@@ -0,0 +1,38 @@
+from typing import Optional
+from flask import current_app, g
+from sqlalchemy import inspect
+from werkzeug.local import LocalProxy
+from app.extensions import jwt
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+
+def get_identity(user_id) -> Optional[User]:
+    """The user with user_id and their profile, loaded once per request and shared by every caller
+
+    An instance expired by a commit earlier in the request is reloaded in
+    the same single joined query.
+    """
+    user_id = int(user_id)
+    identities = g.setdefault("identity_map", {})
+    user = identities.get(user_id)
+    if user_id not in identities or (user is not None and inspect(user).expired):
+        identities[user_id] = UserRepository.get_user_with_profile(user_id)
+    return identities[user_id]
+
+
+def loaded_identity(user_id) -> Optional[User]:
+    """The user with user_id if this request already loaded them, without querying"""
+    user = g.get("identity_map", {}).get(int(user_id))
+    if user is None or inspect(user).expired:
+        return None
+    return user
+
+
+def init_identity(app):
+    @jwt.user_lookup_loader
+    def lookup_user(_jwt_header, jwt_data):
+        # flask_jwt_extended calls this on every @jwt_required request; the proxy defers the
+        # query until a route reads current_user, and services asking for the same user share it
+        identity = jwt_data[current_app.config["JWT_IDENTITY_CLAIM"]]
+        return LocalProxy(lambda: get_identity(identity))
@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import literal, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Collections are ordered by when an entry was added, ties broken by id
+SORTS = {"newest": True, "oldest": False}
+
+
+def keyset_page(stmt, sort_column, id_column, limit, after=None, descending=True):
+    """Order stmt by (sort_column, id_column), start after the `after` key and fetch limit + 1 rows
+
+    The extra row only tells the caller whether another page follows.
+    """
+    key = tuple_(sort_column, id_column)
+    if after is not None:
+        bound = tuple_(literal(after[0], sort_column.type), literal(after[1], id_column.type))
+        stmt = stmt.where(key < bound if descending else key > bound)
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+    return stmt.limit(limit + 1)
+
+
+def encode_cursor(sort, sort_value, item_id):
+    payload = json.dumps([sort, sort_value.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, sort):
+    """Return the (sort value, id) key a cursor continues after; ValueError if it is malformed or for another sort"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        cursor_sort, sort_value, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        key = (datetime.fromisoformat(sort_value), int(item_id))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_sort != sort:
+        raise ValueError("Cursor does not match the requested sort")
+    return key
+
+
+def page_params(args):
+    """(limit, sort, after key) from request args; ValueError on an unknown sort or a bad cursor"""
+    limit = args.get("limit", default=DEFAULT_PAGE_SIZE, type=int)
+    limit = max(min(limit, MAX_PAGE_SIZE), 1)
+    sort = args.get("sort", default="newest", type=str)
+    if sort not in SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(SORTS)}")
+    cursor = args.get("cursor")
+    return limit, sort, decode_cursor(cursor, sort) if cursor else None
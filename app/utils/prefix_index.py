@@ -0,0 +1,145 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from app.utils.text import normalize_text
+
+# Sorts after every character a normalized key can contain
+_KEY_END = "\U0010ffff"
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over titles, ranked by a popularity score
+
+    Every title is indexed from each word start, so "str" finds
+    "Counter-Strike 2". Each prefix of each word keeps its top max_k ids
+    ready, so a one-word query never scans. Multi-word queries rank the
+    titles containing them as typed first, then fill up from the range of
+    their rarest word with titles matching every word in any order.
+    """
+
+    def __init__(self, max_k=20):
+        self.max_k = max_k
+        self._keys = []
+        self._items = {}
+        self._top = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def add(self, item_id, title, score=0.0):
+        """Insert or replace an item; replacing re-ranks it everywhere it appears"""
+        normalized = normalize_text(title)
+        with self._lock:
+            if item_id in self._items:
+                self._remove(item_id)
+            if not normalized:
+                return
+            keys = self._word_suffixes(normalized)
+            self._items[item_id] = (title, score, keys)
+            for key in keys:
+                insort(self._keys, (key, item_id))
+            for prefix in self._word_prefixes(keys):
+                self._push_top(prefix, item_id, score)
+
+    def remove(self, item_id):
+        with self._lock:
+            if item_id in self._items:
+                self._remove(item_id)
+
+    def search(self, query, k=10):
+        """Return up to k (item_id, title) pairs whose title has a word starting with query"""
+        prefix = normalize_text(query)
+        if not prefix:
+            return []
+        k = min(k, self.max_k)
+        tokens = prefix.split(" ")
+        with self._lock:
+            if len(tokens) > 1:
+                ids = self._rank_tokens(prefix, tokens, k)
+            else:
+                if prefix in self._dirty:
+                    self._top[prefix] = self._rank(prefix, self.max_k)
+                    self._dirty.discard(prefix)
+                ids = self._top.get(prefix, [])[:k]
+            return [(item_id, self._items[item_id][0]) for item_id in ids]
+
+    def _remove(self, item_id):
+        _, _, keys = self._items.pop(item_id)
+        for key in keys:
+            index = bisect_left(self._keys, (key, item_id))
+            del self._keys[index]
+        for prefix in self._word_prefixes(keys):
+            top = self._top.get(prefix)
+            if top and item_id in top:
+                top.remove(item_id)
+                # Something below the cut-off may now belong in the list
+                self._dirty.add(prefix)
+
+    def _range(self, prefix):
+        start = bisect_left(self._keys, (prefix,))
+        return start, bisect_left(self._keys, (prefix + _KEY_END,), start)
+
+    def _rank(self, prefix, k):
+        start, end = self._range(prefix)
+        ids = {item_id for _, item_id in self._keys[start:end]}
+        return heapq.nlargest(k, ids, key=lambda item_id: self._items[item_id][1])
+
+    def _rank_tokens(self, prefix, tokens, k):
+        # Titles containing the query as typed, words in order, come first; their keys share its range
+        ids = self._rank(prefix, k)
+        if len(ids) == k:
+            return ids
+        seen = set(ids)
+
+        # Then titles where every token starts some word, in any order
+        def matches(item_id):
+            if item_id in seen:
+                return False
+            words = self._items[item_id][2][0].split(" ")
+            return all(any(word.startswith(token) for word in words) for token in tokens)
+
+        rarest, (start, end) = min(
+            ((token, self._range(token)) for token in tokens), key=lambda bounds: bounds[1][1] - bounds[1][0]
+        )
+        if rarest in self._dirty:
+            self._top[rarest] = self._rank(rarest, self.max_k)
+            self._dirty.discard(rarest)
+        # Anything outside the rarest token's top list scores lower, so enough matches there are final
+        top = self._top.get(rarest, [])
+        extra = [item_id for item_id in top if matches(item_id)][:k - len(ids)]
+        if len(ids) + len(extra) == k or end - start <= len(top):
+            return ids + extra
+        candidates = [(-self._items[item_id][1], item_id) for item_id in {item_id for _, item_id in self._keys[start:end]}]
+        heapq.heapify(candidates)
+        while candidates and len(ids) < k:
+            _, item_id = heapq.heappop(candidates)
+            if matches(item_id):
+                ids.append(item_id)
+        return ids
+
+    def _push_top(self, prefix, item_id, score):
+        top = self._top.setdefault(prefix, [])
+        if item_id in top:
+            return
+        if len(top) >= self.max_k and score <= self._items[top[-1]][1]:
+            return
+        position = len(top)
+        while position > 0 and self._items[top[position - 1]][1] < score:
+            position -= 1
+        top.insert(position, item_id)
+        del top[self.max_k:]
+
+    @staticmethod
+    def _word_prefixes(keys):
+        # Each key starts at a word, so the prefixes of its first word cover every word of the title
+        return {word[:length] for word in (key.split(" ", 1)[0] for key in keys) for length in range(1, len(word) + 1)}
+
+    @staticmethod
+    def _word_suffixes(normalized):
+        words = normalized.split(" ")
+        return list(dict.fromkeys(" ".join(words[start:]) for start in range(len(words))))
@@ -0,0 +1,150 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than its deadline for a token"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket for one upstream budget
+
+    Callers reserve a token under the lock (the balance may go negative)
+    and sleep outside it, so waiting threads queue in arrival order
+    without holding the lock.
+    """
+
+    def __init__(self, name, rate, burst, max_wait=None):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "rejected": 0, "waited": 0, "total_wait": 0.0, "max_wait": 0.0}
+
+    def reserve(self, max_wait=None):
+        """Take a token and return how long the caller must wait before using it"""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        wait = self._reserve(max_wait)
+        with self._lock:
+            if wait is None:
+                self._stats["rejected"] += 1
+            else:
+                self._stats["acquired"] += 1
+                if wait > 0:
+                    self._stats["waited"] += 1
+                    self._stats["total_wait"] += wait
+                    self._stats["max_wait"] = max(self._stats["max_wait"], wait)
+        if wait is None:
+            logger.warning(f"Rate limit budget '{self.name}' exhausted beyond {max_wait}s")
+            raise RateLimitExceeded(f"Rate limit budget '{self.name}' exhausted")
+        return wait
+
+    def acquire(self, max_wait=None):
+        """Block until a token is available, or raise RateLimitExceeded past the deadline"""
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _reserve(self, max_wait):
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            wait = _wait_for(tokens, self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens = tokens - 1
+            self._updated = now
+            return wait
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, name=self.name, rate=self.rate, burst=self.burst)
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """Token bucket whose balance lives in a SQLite file shared by every worker on the host"""
+
+    def __init__(self, name, rate, burst, path, max_wait=None):
+        super().__init__(name, rate, burst, max_wait)
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _reserve(self, max_wait):
+        conn = self._connect()
+        # Wall-clock time, since the balance is compared across processes
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE name = ?", (self.name,)).fetchone()
+            tokens = float(self.burst) if row is None else min(float(self.burst), row[0] + (now - row[1]) * self.rate)
+            wait = _wait_for(tokens, self.rate)
+            if max_wait is not None and wait > max_wait:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens - 1, now),
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _wait_for(tokens, rate):
+    return (1 - tokens) / rate if tokens < 1 else 0.0
+
+
+class RateLimiter:
+    """Named upstream budgets, e.g. one per Steam host"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+
+    def reserve(self, budget, max_wait=None):
+        return self.buckets[budget].reserve(max_wait)
+
+    def acquire(self, budget, max_wait=None):
+        return self.buckets[budget].acquire(max_wait)
+
+    def stats(self):
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
+
+
+def init_rate_limiter(app):
+    config = app.config
+    budgets = {
+        "api": (config["STEAM_API_RATE_LIMIT"], config["STEAM_API_RATE_BURST"]),
+        "store": (config["STEAM_STORE_RATE_LIMIT"], config["STEAM_STORE_RATE_BURST"]),
+    }
+    max_wait = config["STEAM_RATE_LIMIT_MAX_WAIT"]
+    if config["STEAM_RATE_LIMIT_BACKEND"] == "sqlite":
+        path = config["STEAM_RATE_LIMIT_PATH"] or os.path.join(app.instance_path, "steam_rate_limit.sqlite3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        buckets = {name: SQLiteTokenBucket(name, rate, burst, path, max_wait) for name, (rate, burst) in budgets.items()}
+    else:
+        buckets = {name: TokenBucket(name, rate, burst, max_wait) for name, (rate, burst) in budgets.items()}
+    app.extensions["steam_rate_limiter"] = RateLimiter(buckets)
+    return app.extensions["steam_rate_limiter"]
@@ -0,0 +1,88 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+
+class EncodedResponse:
+    """A JSON body encoded once, with a strong ETag
+
+    The ETag also keys the compressed copies kept by app.utils.compression,
+    so each body is compressed once per encoding.
+    """
+
+    __slots__ = ("body", "mimetype", "etag")
+
+    def __init__(self, body, mimetype="application/json"):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    @classmethod
+    def from_data(cls, data):
+        # Same bytes jsonify would send
+        response = current_app.json.response(data)
+        return cls(response.get_data(), response.mimetype)
+
+    def to_response(self, status=200):
+        response = current_app.response_class(self.body, status=status, mimetype=self.mimetype)
+        response.set_etag(self.etag)
+        return response
+
+
+class ResponseCache:
+    """Process-local LRU of encoded responses, each reused while the data it was built from is unchanged
+
+    version identifies that data without reading it, e.g. the app ids of a
+    listing with the cache versions of their detail entries, so a hit
+    costs no decoding, hashing or encoding of the records themselves.
+    """
+
+    def __init__(self, max_entries=500, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """Return the EncodedResponse stored for key at version, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, data):
+        """Encode data and store it for key at version, replacing any older body"""
+        encoded = EncodedResponse.from_data(data)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1].body)
+            self._entries[key] = (version, encoded)
+            self._bytes += len(encoded.body)
+            self._evict()
+        return encoded
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, (_, encoded) = self._entries.popitem(last=False)
+            self._bytes -= len(encoded.body)
+
+
+def init_response_cache(app):
+    app.extensions["steam_response_cache"] = ResponseCache(
+        max_entries=app.config["STEAM_RESPONSE_CACHE_MAX_ENTRIES"],
+        max_bytes=app.config["STEAM_RESPONSE_CACHE_MAX_BYTES"],
+    )
+    return app.extensions["steam_response_cache"]
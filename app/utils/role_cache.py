@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+Roles = namedtuple("Roles", ["is_admin", "is_active"])
+
+
+class RoleCache:
+    """Process-local LRU of users' admin and active flags, each trusted for ttl seconds
+
+    The role claims minted into access tokens are trusted for the same
+    ttl after issue, so a role change reaches every process within ttl
+    seconds. invalidate() makes it immediate in this process: it drops the
+    user's entry and stops trusting claims issued before the change.
+    """
+
+    def __init__(self, ttl=60, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # user id -> (monotonic expiry, Roles)
+        self._changed_at = {}  # user id -> wall time of the last invalidate()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id, roles):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._entries[user_id] = (time.monotonic() + self.ttl, roles)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        now = time.time()
+        with self._lock:
+            self._entries.pop(user_id, None)
+            # Claims older than ttl are not trusted anyway, so older changes need no record
+            self._changed_at = {uid: at for uid, at in self._changed_at.items() if now - at < self.ttl}
+            self._changed_at[user_id] = now
+
+    def trusts_claims(self, user_id, issued_at):
+        """Whether role claims issued at issued_at (epoch seconds) still stand for user_id"""
+        now = time.time()
+        with self._lock:
+            changed_at = self._changed_at.get(user_id)
+        # Issue times are whole seconds, so a token minted in the second of a change is not trusted
+        return now - issued_at < self.ttl and (changed_at is None or issued_at > changed_at)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._changed_at.clear()
+
+
+def init_role_cache(app):
+    app.extensions["role_cache"] = RoleCache(
+        ttl=app.config["ROLE_CACHE_TTL"],
+        max_entries=app.config["ROLE_CACHE_MAX_ENTRIES"],
+    )
+    return app.extensions["role_cache"]
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single execution
+
+    Sync and async callers share one table, so a thread and a coroutine
+    asking for the same key still trigger only one call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def _join(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = Future()
+            return call, True
+
+    def _finish(self, key, call, result=None, error=None):
+        with self._lock:
+            del self._calls[key]
+        if error is not None:
+            call.set_exception(error)
+        else:
+            call.set_result(result)
+
+    def do(self, key, fn):
+        """Run fn for key, or wait for the call already in flight and share its result"""
+        call, leader = self._join(key)
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+        self._finish(key, call, result)
+        return result
+
+    async def do_async(self, key, fn):
+        """Await fn() for key, or await the call already in flight from any thread or loop"""
+        call, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(call)
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            # A cancelled leader must still release its followers
+            self._finish(key, call, error=e)
+            raise
+        self._finish(key, call, result)
+        return result
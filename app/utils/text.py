@@ -0,0 +1,26 @@
+import re
+import unicodedata
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(value):
+    """Fold case, accents and punctuation so "Pokémon: RED " and "pokemon red" compare equal"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_WORD_RE.sub(" ", stripped.casefold()).strip()
+
+
+def clean_query(value):
+    """Compose compatibility forms and collapse whitespace, keeping marks, scripts and punctuation as typed
+
+    normalize_text is only fit for comparison keys: its NFKD fold turns
+    "ガンダム" into "カンタム", splits Hangul into jamo and drops the "++"
+    of "C++". Text sent to a search backend goes through this instead.
+    """
+    if not value:
+        return ""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", value)).strip()
@@ -0,0 +1,96 @@
+"""Memory held by the Steam cache for a catalog of cached apps, old layout vs new.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_cache_memory [--apps 10000] [--listings 500]
+
+Apps are formatted from the stub corpus the way SteamService formats
+appdetails, then each one goes through a JSON round trip, as a cache
+read or an upstream fetch would, so no strings are shared by accident.
+Two layouts are measured with tracemalloc:
+
+    dicts    one formatted dict per app, plus listing and search entries
+             holding their own dicts for the apps they list (what the
+             SQLite backend decodes, and what a memory-cache listing keeps
+             once its apps' entries have been refreshed)
+    records  one GameRecord per app with interned labels, plus listing
+             and search entries holding only app ids
+
+Byte accounting is what MemoryCache charges against STEAM_CACHE_MAX_BYTES
+and what the SQLite backend writes to disk.
+"""
+import argparse
+import gc
+import json
+import random
+import tempfile
+import tracemalloc
+
+from app.services.steam_service import GameRecord, SteamService
+from app.utils.cache import _sizeof
+from benchmarks.harness import create_bench_app
+from benchmarks.steam_stub import StubSteam
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return kept, used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=10000)
+    parser.add_argument("--listings", type=int, default=500, help="Listing and search entries cached next to the apps")
+    parser.add_argument("--listing-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    stub = StubSteam(apps=args.apps, seed=args.seed)
+    app = create_bench_app(stub, tempfile.mkdtemp())
+    with app.app_context():
+        steam = SteamService()
+        payloads = []
+        for app_id in stub.app_ids:
+            data = stub.corpus.app_details([app_id])
+            game = steam._parse_game_details(app_id, data)
+            if game:
+                payloads.append(json.dumps(game))
+    app_ids = [json.loads(payload)["id"] for payload in payloads]
+    listings = [rng.sample(app_ids, args.listing_size) for _ in range(args.listings)]
+
+    by_id = dict(zip(app_ids, payloads))
+    layouts = {
+        "dicts": (
+            lambda: {str(app_id): json.loads(by_id[app_id]) for app_id in app_ids},
+            lambda: [[json.loads(by_id[app_id]) for app_id in listing] for listing in listings],
+        ),
+        "records": (
+            lambda: {str(app_id): GameRecord.from_dict(json.loads(by_id[app_id])) for app_id in app_ids},
+            lambda: [list(listing) for listing in listings],
+        ),
+    }
+
+    results = {"apps": len(payloads), "listings": args.listings, "listing_size": args.listing_size}
+    for name, (build_details, build_pages) in layouts.items():
+        details, details_heap = measure(build_details)
+        pages, pages_heap = measure(build_pages)
+        results[name] = {
+            "heap_mb": round((details_heap + pages_heap) / 2**20, 2),
+            "details_heap_bytes_per_app": round(details_heap / len(payloads)),
+            "listings_heap_kb": round(pages_heap / 2**10, 1),
+            "accounted_mb": round((sum(map(_sizeof, details.values())) + sum(map(_sizeof, pages))) / 2**20, 2),
+        }
+        del details, pages
+    results["heap_saved_pct"] = round(100 * (1 - results["records"]["heap_mb"] / results["dicts"]["heap_mb"]), 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
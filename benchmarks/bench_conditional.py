@@ -0,0 +1,75 @@
+"""Bandwidth, latency and database cost of repeated polls with and without conditional GET.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_conditional [--library 2000] [--wishlist 500] [--polls 50]
+
+Each endpoint is polled --polls times as a client without validators
+would, then as one that sends back the ETag of its first response. The
+second kind should get 304s with no body and, for the library and
+wishlist, skip loading the collection.
+"""
+import argparse
+import json
+import tempfile
+import time
+
+from benchmarks.harness import count_queries, create_bench_app, seed_user_collection
+from benchmarks.steam_stub import StubSteam
+
+
+def poll(app, client, path, headers, polls, conditional):
+    etag = client.get(path, headers=headers).headers.get("ETag")
+    request_headers = dict(headers, **({"If-None-Match": etag} if conditional and etag else {}))
+    statuses = {}
+    sent = 0
+    with count_queries(app) as counter:
+        started = time.perf_counter()
+        for _ in range(polls):
+            response = client.get(path, headers=request_headers)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            sent += len(response.get_data())
+        elapsed = time.perf_counter() - started
+    return {
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "bytes_per_poll": round(sent / polls),
+        "ms_per_poll": round(elapsed / polls * 1000, 3),
+        "queries_per_poll": round(counter["queries"] / polls, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--library", type=int, default=2000)
+    parser.add_argument("--wishlist", type=int, default=500)
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+
+    stub = StubSteam(latency=0.0, apps=200).start()
+    app = create_bench_app(stub, tempfile.mkdtemp())
+    user_id, token = seed_user_collection(app, args.library, args.wishlist)
+    auth = {"Authorization": f"Bearer {token}"}
+    endpoints = {
+        "library": (f"/api/user/{user_id}/library", auth),
+        "wishlist": (f"/api/wishlist_items/user/{user_id}/wishlist", auth),
+        "me": ("/api/user/me", auth),
+        "steam_top_games": ("/api/steam/top-games?limit=50", {}),
+    }
+
+    client = app.test_client()
+    results = {}
+    for name, (path, headers) in endpoints.items():
+        full = poll(app, client, path, headers, args.polls, conditional=False)
+        conditional = poll(app, client, path, headers, args.polls, conditional=True)
+        results[name] = {
+            "full": full,
+            "conditional": conditional,
+            "bytes_saved_pct": round(100 * (1 - conditional["bytes_per_poll"] / full["bytes_per_poll"]), 1),
+            "speedup": round(full["ms_per_poll"] / conditional["ms_per_poll"], 1),
+        }
+    stub.stop()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Latency and payload of paging through small and large collections.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pagination [--small 50] [--large 5000] [--limit 50]
+
+Seeds one user with a small library and wishlist and one with a large
+one, then follows next_cursor through every page of each collection in
+both sort orders. Each page should cost about the same whatever the
+collection size or how deep it is, and the pages together must cover
+the collection exactly once.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import create_bench_app, percentile, seed_user_collection
+from benchmarks.steam_stub import StubSteam
+
+ENDPOINTS = {
+    "library": "/api/user/{user_id}/library",
+    "wishlist": "/api/wishlist_items/user/{user_id}/wishlist",
+}
+
+
+def walk(client, path, token, limit, sort):
+    """Follow next_cursor to the end; return per-page timings, payload sizes and the ids seen"""
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"limit": limit, "sort": sort}
+    timings, sizes, ids = [], [], []
+    while True:
+        started = time.perf_counter()
+        response = client.get(path, headers=headers, query_string=params)
+        timings.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise SystemExit(f"GET {path} returned {response.status_code}")
+        sizes.append(len(response.get_data()))
+        body = response.get_json()
+        ids.extend(item["game"]["id"] for item in body["data"])
+        if not body["next_cursor"]:
+            return timings, sizes, ids
+        params["cursor"] = body["next_cursor"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--small", type=int, default=50)
+    parser.add_argument("--large", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_bench_app(StubSteam(), tempfile.mkdtemp())
+    # Admins pass the ownership check whichever type the token identity has
+    users = {
+        size: seed_user_collection(app, size, size, username=f"user{size}")
+        for size in (args.small, args.large)
+    }
+
+    client = app.test_client()
+    results = {}
+    failed = False
+    for name, template in ENDPOINTS.items():
+        for size, (user_id, token) in users.items():
+            for sort in ("newest", "oldest"):
+                timings, sizes, ids = walk(client, template.format(user_id=user_id), token, args.limit, sort)
+                complete = len(ids) == size and len(set(ids)) == size
+                failed = failed or not complete
+                timings.sort()
+                results[f"{name}_{size}_{sort}"] = {
+                    "pages": len(timings),
+                    "p50_ms": round(percentile(timings, 50) * 1000, 3),
+                    "p99_ms": round(percentile(timings, 99) * 1000, 3),
+                    "max_page_bytes": max(sizes),
+                    "complete": complete,
+                }
+
+    print(json.dumps(results, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Compare the single-pass description sanitizer with the previous multi-pass one.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sanitizer [--repeat 20]
+
+The corpus is built from the markup Steam uses in ``detailed_description``
+(bb_tag headings, bb_ul lists, images, links, entities). Recorded
+appdetails fixtures are added to it when they are present.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import time
+
+from app.utils.html_sanitizer import sanitize_html_description
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "appdetails")
+
+
+def legacy_sanitize_html_description(description):
+    """The sanitizer SteamService used before the single-pass tokenizer"""
+    if not description:
+        return ""
+    cleaned = re.sub(r'<br\s*/?>', '\n', description)
+    cleaned = re.sub(r'<ul[^>]*>', '\n', cleaned)
+    cleaned = re.sub(r'</ul>', '\n', cleaned)
+    cleaned = re.sub(r'<li[^>]*>', '• ', cleaned)
+    cleaned = re.sub(r'</li>', '\n', cleaned)
+    cleaned = re.sub(r'<h[1-6][^>]*>(.*?)</h[1-6]>', r'\1\n', cleaned)
+    cleaned = re.sub(r'<p[^>]*>(.*?)</p>', r'\1\n', cleaned)
+    cleaned = re.sub(r'<div[^>]*>(.*?)</div>', r'\1', cleaned)
+    cleaned = re.sub(r'<span[^>]*>(.*?)</span>', r'\1', cleaned)
+    cleaned = re.sub(r'<[^>]+>', '', cleaned)
+    cleaned = cleaned.replace('&nbsp;', ' ')
+    cleaned = cleaned.replace('&amp;', '&')
+    cleaned = cleaned.replace('&lt;', '<')
+    cleaned = cleaned.replace('&gt;', '>')
+    cleaned = cleaned.replace('&quot;', '"')
+    cleaned = cleaned.replace('&#39;', "'")
+    cleaned = re.sub(r'\n\s*\n', '\n\n', cleaned)
+    return cleaned.strip()
+
+
+WORDS = ("explore vast open world survive craft build fight legendary heroes co-op multiplayer "
+         "campaign story quest dungeon loot upgrade skill tree boss raid season pass").split()
+
+
+def _sentence(rng):
+    words = rng.choices(WORDS, k=rng.randint(8, 20))
+    return " ".join(words).capitalize() + rng.choice([".", " &amp; more.", " &mdash; and beyond!", "&nbsp;now."])
+
+
+def synthetic_description(rng):
+    parts = []
+    for section in range(rng.randint(4, 10)):
+        parts.append(f'<h2 class="bb_tag">Section {section} &quot;{rng.choice(WORDS)}&quot;</h2>')
+        parts.append(f'<img src="https://cdn.akamai.steamstatic.com/steam/apps/{rng.randint(10, 99999)}/extras/{section}.gif?t=1700000000" />')
+        parts.append("<br>".join(_sentence(rng) for _ in range(rng.randint(2, 6))))
+        parts.append('<br><ul class="bb_ul">')
+        parts.extend(f"<li><strong>{rng.choice(WORDS).title()}</strong> - {_sentence(rng)}</li>" for _ in range(rng.randint(3, 8)))
+        parts.append("</ul><br>")
+        parts.append(f'<p class="bb_paragraph">{_sentence(rng)} <a href="https://steamcommunity.com/linkfilter/?u=https%3A%2F%2Fexample.com" target="_blank" rel="noopener">Join us</a></p>')
+    return "".join(parts)
+
+
+def load_corpus(size, seed=7):
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.json"))):
+        with open(path) as f:
+            for result in json.load(f).values():
+                description = (result.get("data") or {}).get("detailed_description")
+                if description:
+                    corpus.append(description)
+    rng = random.Random(seed)
+    while len(corpus) < size:
+        corpus.append(synthetic_description(rng))
+    return corpus
+
+
+def _throughput(fn, corpus, repeat):
+    total_bytes = sum(len(text.encode("utf-8")) for text in corpus) * repeat
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in corpus:
+            fn(text)
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": round(elapsed, 4),
+        "mb_per_s": round(total_bytes / elapsed / 1e6, 2),
+        "docs_per_s": round(len(corpus) * repeat / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200, help="Number of descriptions in the corpus")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.size)
+    legacy = _throughput(legacy_sanitize_html_description, corpus, args.repeat)
+    current = _throughput(sanitize_html_description, corpus, args.repeat)
+    print(json.dumps({
+        "corpus": {
+            "documents": len(corpus),
+            "avg_kb": round(sum(len(text) for text in corpus) / len(corpus) / 1024, 1),
+        },
+        "legacy": legacy,
+        "single_pass": current,
+        "speedup": round(legacy["seconds"] / current["seconds"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
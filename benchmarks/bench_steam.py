@@ -0,0 +1,157 @@
+"""Latency, throughput and upstream cost of the /api/steam blueprint against the stub Steam server.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_steam [--concurrency 16] [--latency 0.05] [--output results.json]
+
+Requests go through the Flask app in-process. The upstream is
+benchmarks.steam_stub on a random local port. Scenarios:
+
+    cold              homepage listings, detail pages and searches on an empty cache and catalog
+    warm              the same traffic replayed once everything is cached
+    stampede_expired  a burst of identical listing requests right after the cache was emptied
+    stampede_stale    the same burst once the listings are past their soft TTL
+    mixed_search      Zipf-distributed search terms with detail lookups, starting uncached
+
+Each scenario reports p50/p95/p99 latency, requests/sec and upstream
+calls per request. The JSON output carries the commit it ran on, so two
+runs can be diffed to catch caching or throttling regressions.
+"""
+import argparse
+import json
+import random
+import subprocess
+import tempfile
+import time
+
+from benchmarks.harness import create_bench_app, drive, reset, summarize
+from benchmarks.steam_stub import TITLE_WORDS, StubSteam
+
+LISTINGS = ("/api/steam/top-games", "/api/steam/featured-games", "/api/steam/discounted-games")
+HOT_LISTINGS = ("/api/steam/top-games?limit=10", "/api/steam/featured-games?limit=10", "/api/steam/discounted-games?limit=10")
+
+
+def _zipf_choice(rng, items, s=1.1):
+    weights = [1 / (rank ** s) for rank in range(1, len(items) + 1)]
+    return rng.choices(items, weights=weights)[0]
+
+
+def homepage_paths(app_ids, details, searches, rng):
+    paths = [f"{listing}?limit={limit}" for listing in LISTINGS for limit in (10, 20, 30)]
+    paths += [f"/api/steam/games/{app_id}" for app_id in rng.sample(app_ids, details)]
+    paths += [f"/api/steam/search?q={term}" for term in rng.sample(TITLE_WORDS, searches)]
+    rng.shuffle(paths)
+    return paths
+
+
+def search_paths(app_ids, count, rng):
+    terms = TITLE_WORDS + [f"{a} {b}" for a, b in zip(TITLE_WORDS, TITLE_WORDS[1:])]
+    rng.shuffle(terms)
+    paths = []
+    for _ in range(count):
+        if rng.random() < 0.25:
+            paths.append(f"/api/steam/games/{_zipf_choice(rng, app_ids)}")
+        else:
+            paths.append(f"/api/steam/search?q={_zipf_choice(rng, terms)}&limit={rng.choice((10, 20))}")
+    return paths
+
+
+def _wait_for_refreshes(timeout=30):
+    from app.services.steam_service import SteamService
+
+    deadline = time.monotonic() + timeout
+    while SteamService._refreshing and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def run(app, stub, paths, concurrency):
+    stub.reset_stats()
+    latencies, statuses, wall = drive(app, paths, concurrency)
+    _wait_for_refreshes()
+    return summarize(latencies, statuses, wall, stub.stats())
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client threads")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Mean of the stub's exponential latency tail")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--details", type=int, default=60, help="Distinct detail pages in the cold and warm traffic")
+    parser.add_argument("--repeat", type=int, default=5, help="Times the warm scenario replays the cold traffic")
+    parser.add_argument("--stampede", type=int, default=300, help="Requests in each stampede burst")
+    parser.add_argument("--searches", type=int, default=600, help="Requests in the mixed search scenario")
+    parser.add_argument("--soft-ttl", type=int, default=1, help="Soft TTL the stale stampede primes its listings with")
+    parser.add_argument("--throttled", action="store_true", help="Keep the configured Steam rate limits")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    stub = StubSteam(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, seed=args.seed,
+    ).start()
+    app_ids = stub.app_ids[:200]
+    scenarios = {}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            app = create_bench_app(stub, workdir, throttled=args.throttled)
+            reset(app, stub)
+            cold = homepage_paths(app_ids, args.details, 10, rng)
+            scenarios["cold"] = run(app, stub, cold, args.concurrency)
+            scenarios["warm"] = run(app, stub, rng.sample(cold * args.repeat, len(cold) * args.repeat), args.concurrency)
+
+            app.extensions["steam_cache"].clear()
+            burst = [HOT_LISTINGS[n % len(HOT_LISTINGS)] for n in range(args.stampede)]
+            scenarios["stampede_expired"] = run(app, stub, burst, args.concurrency)
+
+            # Prime the hot listings with a short soft TTL, then let them go stale
+            soft_ttl = app.config["STEAM_CACHE_SOFT_TTL"]
+            app.config["STEAM_CACHE_SOFT_TTL"] = args.soft_ttl
+            app.extensions["steam_cache"].clear()
+            run(app, stub, HOT_LISTINGS, args.concurrency)
+            app.config["STEAM_CACHE_SOFT_TTL"] = soft_ttl
+            time.sleep(args.soft_ttl + 0.1)
+            scenarios["stampede_stale"] = run(app, stub, burst, args.concurrency)
+
+            reset(app, stub)
+            scenarios["mixed_search"] = run(app, stub, search_paths(app_ids, args.searches, rng), args.concurrency)
+
+            results = {
+                "commit": _commit(),
+                "settings": {
+                    "concurrency": args.concurrency,
+                    "stub_latency": args.latency,
+                    "stub_jitter": args.jitter,
+                    "stub_error_rate": args.error_rate,
+                    "stub_throttle_rate": args.throttle_rate,
+                    "throttled": args.throttled,
+                    "seed": args.seed,
+                    "cache_backend": app.config["STEAM_CACHE_BACKEND"],
+                    "max_workers": app.config["STEAM_MAX_WORKERS"],
+                },
+                "scenarios": scenarios,
+            }
+    finally:
+        stub.stop()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
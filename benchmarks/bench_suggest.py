@@ -0,0 +1,76 @@
+"""Build time and query latency of the typeahead prefix index.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suggest [--titles 10000] [--queries 20000]
+
+Titles come from the stub Steam corpus. Queries are the keystroke
+prefixes a user would type for randomly chosen titles, so one- and
+two-letter prefixes, which match the most titles, are weighted like
+real typeahead traffic.
+"""
+import argparse
+import json
+import random
+import time
+
+from app.utils.prefix_index import PrefixIndex
+from benchmarks.harness import percentile
+from benchmarks.steam_stub import SteamCorpus
+
+
+def keystroke_queries(titles, count, rng):
+    queries = []
+    while len(queries) < count:
+        words = rng.choice(titles).lower().split()
+        typed = " ".join(words[:rng.randint(1, min(2, len(words)))])
+        for length in range(1, len(typed) + 1):
+            if not typed[:length].endswith(" "):
+                queries.append(typed[:length])
+    return queries[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = SteamCorpus(apps=args.titles, seed=args.seed)
+    scores = {app_id: rng.random() * 10 for app_id in corpus.app_ids}
+
+    index = PrefixIndex()
+    started = time.perf_counter()
+    for app_id, title in corpus.names.items():
+        index.add(app_id, title, scores[app_id])
+    build = time.perf_counter() - started
+
+    queries = keystroke_queries(list(corpus.names.values()), args.queries, rng)
+    by_words = {1: [], 2: []}
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, args.k)
+        by_words[min(len(query.split()), 2)].append(time.perf_counter() - started)
+
+    def latency(samples):
+        ordered = sorted(samples)
+        return {
+            "queries": len(ordered),
+            "p50_us": round(percentile(ordered, 50) * 1e6, 1),
+            "p99_us": round(percentile(ordered, 99) * 1e6, 1),
+            "max_us": round(ordered[-1] * 1e6, 1),
+        } if ordered else None
+
+    print(json.dumps({
+        "titles": len(index),
+        "build_seconds": round(build, 3),
+        "one_word": latency(by_words[1]),
+        "multi_word": latency(by_words[2]),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
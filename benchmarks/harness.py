@@ -0,0 +1,159 @@
+"""Shared setup for benchmarks that drive the app against the stub Steam server."""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+# Token budgets high enough that the limiter never delays a benchmark
+UNTHROTTLED = {
+    "STEAM_API_RATE_LIMIT": 100000,
+    "STEAM_API_RATE_BURST": 100000,
+    "STEAM_STORE_RATE_LIMIT": 100000,
+    "STEAM_STORE_RATE_BURST": 100000,
+}
+
+
+def create_bench_app(stub, workdir, throttled=False, **overrides):
+    """Build the app against the stub with a throwaway SQLite catalog and an in-memory cache
+
+    Unless throttled is set, the Steam rate limits are lifted so results
+    reflect caching rather than the configured budgets.
+    """
+    from flask_migrate import upgrade
+    from app import create_app
+
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}",
+        "STEAM_API_URL": stub.api_url,
+        "STEAM_STORE_URL": stub.store_url,
+        "STEAM_CACHE_BACKEND": "memory",
+        "STEAM_RATE_LIMIT_BACKEND": "local",
+        "STEAM_WARMER_INTERVAL": 0,
+        "JWT_SECRET_KEY": "bench-only-signing-key-0123456789abcdef",
+    }
+    if not throttled:
+        config.update(UNTHROTTLED)
+    config.update(overrides)
+    app = create_app("production", config)
+    # Migrations rather than create_all, so the catalog gets its full-text index
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+    return app
+
+
+def reset(app, stub):
+    """Empty the cache, the Steam rows of the catalog and the stub's counters"""
+    from app.extensions import db
+    from app.models.game import Game
+
+    with app.app_context():
+        app.extensions["steam_cache"].clear()
+        Game.query.filter(Game.steam_appid.isnot(None)).delete()
+        db.session.commit()
+    stub.reset_stats()
+
+
+@contextmanager
+def count_queries(app):
+    """Count the SQL statements the app's engine executes inside the block, as counter["queries"]"""
+    from sqlalchemy import event
+    from app.extensions import db
+
+    counter = {"queries": 0}
+
+    def before_cursor_execute(*args):
+        counter["queries"] += 1
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def drive(app, paths, concurrency):
+    """GET every path through the WSGI app from `concurrency` client threads
+
+    Returns (latencies in seconds, {status: count}, wall seconds).
+    """
+    local = threading.local()
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+
+    def fetch(path):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        started = time.perf_counter()
+        status = client.get(path).status_code
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench-client") as executor:
+        list(executor.map(fetch, paths))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def summarize(latencies, statuses, wall, stub_stats):
+    """Latency percentiles in milliseconds, throughput and upstream cost per request"""
+    ordered = sorted(latencies)
+    requests = len(ordered)
+    return {
+        "requests": requests,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2) if ordered else None,
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2) if ordered else None,
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2) if ordered else None,
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else None,
+        "rps": round(requests / wall, 1) if wall else None,
+        "upstream_calls": stub_stats["requests"],
+        "upstream_per_request": round(stub_stats["requests"] / requests, 3) if requests else None,
+        "upstream_peak_in_flight": stub_stats["peak_in_flight"],
+        "upstream_statuses": {str(status): count for status, count in sorted(stub_stats["by_status"].items())},
+    }
+
+
+def seed_user_collection(app, library_size, wishlist_size, username="bench", admin=False):
+    """Create a user owning library_size games and wishlisting wishlist_size others
+
+    Returns (user_id, access token). The games are local catalog rows with
+    descriptions of a realistic length.
+    """
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.game import Game
+    from app.models.user_library import UserLibrary
+    from app.models.wishlist_item import WishlistItem
+    from app.services.auth_service import AuthService
+
+    with app.app_context():
+        user = AuthService.register(f"{username}@example.com", username, "Bench", "User", "US", "bench-password")
+        user.is_admin = admin
+        games = [
+            Game(title=f"{username} game {n}", price=19.99, release_year=2020, status="Available",
+                 category="Action, Adventure", description="A long description. " * 40, platform="Windows")
+            for n in range(library_size + wishlist_size)
+        ]
+        db.session.add_all(games)
+        db.session.flush()
+        db.session.add_all(UserLibrary(user_id=user.id, game_id=game.id) for game in games[:library_size])
+        db.session.add_all(WishlistItem(user_id=user.id, game_id=game.id) for game in games[library_size:])
+        db.session.commit()
+        claims = {"username": username, **AuthService.role_claims(user)}
+        return user.id, create_access_token(identity=str(user.id), additional_claims=claims)
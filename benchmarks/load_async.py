@@ -0,0 +1,104 @@
+"""Compare the thread-pool and asyncio Steam clients on cold listings against a stub Steam server.
+
+Run from the repository root:
+
+    python -m benchmarks.load_async [--latency 0.25] [--apps 50 200] [--clients 20]
+
+Every scenario starts with an empty cache and catalog, so each listed app
+costs one appdetails call. Rate limits are raised out of the way; the
+numbers show how many upstream calls each client keeps in flight.
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import create_bench_app, reset
+from benchmarks.steam_stub import StubSteam
+
+
+def _result(started, games, stub):
+    elapsed = time.perf_counter() - started
+    stats = stub.stats()
+    return {
+        "seconds": round(elapsed, 3),
+        "games": games,
+        "upstream_calls": stats["requests"],
+        "peak_in_flight": stats["peak_in_flight"],
+    }
+
+
+def run_sync(app, stub, apps):
+    from app.services.steam_service import SteamService
+
+    reset(app, stub)
+    started = time.perf_counter()
+    with app.app_context():
+        games = SteamService().get_top_games(limit=apps)
+    return _result(started, len(games), stub)
+
+
+def run_async(app, stub, apps):
+    from app.services.async_steam_service import AsyncSteamService
+
+    reset(app, stub)
+    started = time.perf_counter()
+    with app.app_context():
+        games = asyncio.run(AsyncSteamService().get_top_games(limit=apps))
+    return _result(started, len(games), stub)
+
+
+def run_view_clients(app, stub, clients):
+    """Concurrent clients each asking the async view for a different uncached game"""
+    reset(app, stub)
+    statuses = []
+
+    def fetch(app_id):
+        statuses.append(app.test_client().get(f"/api/steam/games/{app_id}").status_code)
+
+    threads = [threading.Thread(target=fetch, args=(app_id,)) for app_id in stub.app_ids[:clients]]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result = _result(started, statuses.count(200), stub)
+    result["clients"] = clients
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.25, help="Stub response latency in seconds")
+    parser.add_argument("--apps", type=int, nargs="+", default=[50, 200], help="Listing sizes to fetch cold")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent clients for the view scenario")
+    args = parser.parse_args()
+
+    stub = StubSteam(latency=args.latency, apps=max(args.apps + [args.clients])).start()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            app = create_bench_app(stub, workdir)
+            scenarios = {}
+            for apps in args.apps:
+                sync = run_sync(app, stub, apps)
+                async_ = run_async(app, stub, apps)
+                scenarios[f"top_games_{apps}"] = {
+                    "thread_pool": sync,
+                    "asyncio": async_,
+                    "speedup": round(sync["seconds"] / async_["seconds"], 2),
+                }
+            scenarios["async_view_clients"] = run_view_clients(app, stub, args.clients)
+            print(json.dumps({
+                "stub_latency": args.latency,
+                "max_workers": app.config["STEAM_MAX_WORKERS"],
+                "async_max_connections": app.config["STEAM_ASYNC_MAX_CONNECTIONS"],
+                "scenarios": scenarios,
+            }, indent=2))
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Local stand-in for the Steam Web API and storefront API.
+
+Serves every endpoint SteamService calls (GetMostPlayedGames,
+GetNewsForApp, featured, featuredcategories, storesearch and appdetails,
+including batched price_overview lookups) with configurable latency,
+random 5xx errors and 429 throttling, and counts requests, statuses and
+peak in-flight concurrency so benchmarks can see how hard a code path
+hits upstream.
+
+    python -m benchmarks.steam_stub [--port 8765] [--latency 0.1] [--jitter 0.05]
+        [--error-rate 0.01] [--throttle-rate 0.01] [--rps-limit 50] [--seed 7]
+
+Then point the app at it:
+
+    STEAM_API_URL=http://127.0.0.1:8765 STEAM_STORE_URL=http://127.0.0.1:8765/api
+
+Responses are replayed from benchmarks/fixtures when a recording exists:
+
+    fixtures/GetMostPlayedGames.json     fixtures/appdetails/<appid>.json
+    fixtures/featured.json               fixtures/news/<appid>.json
+    fixtures/featuredcategories.json     fixtures/storesearch/<term>.json
+
+Anything not recorded is generated deterministically from the seed, so
+runs are repeatable without a recording. To record a corpus from the
+live API (needs network access):
+
+    python -m benchmarks.steam_stub record [--apps 100]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.bench_sanitizer import synthetic_description
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+LIVE_API_URL = "https://api.steampowered.com"
+LIVE_STORE_URL = "https://store.steampowered.com/api"
+FIRST_APP_ID = 100000
+
+TITLE_WORDS = ("Shadow Iron Star Dust Hollow Crimson Frontier Echo Rogue Titan Neon Ember "
+               "Legends Tactics Odyssey Survivors Kingdom Protocol Arena Drift Saga Colony").split()
+CATEGORIES = ("Single-player", "Multi-player", "Co-op", "Online PvP", "Steam Achievements",
+              "Full controller support", "Steam Trading Cards", "Steam Cloud", "Remote Play Together")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections when an async client opens dozens at once
+    request_queue_size = 256
+
+
+def _term_key(term):
+    return re.sub(r"[^a-z0-9]+", "_", term.lower()).strip("_")
+
+
+class SteamCorpus:
+    """Recorded Steam responses, topped up with seeded synthetic apps"""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, apps=500, seed=7):
+        self.fixtures_dir = fixtures_dir
+        self.seed = seed
+        self.recorded = {}
+        self._synthetic = {}
+        for path in self._glob("appdetails"):
+            with open(path) as f:
+                for app_id, result in json.load(f).items():
+                    self.recorded[int(app_id)] = result
+        self.app_ids = list(self.recorded)
+        synthetic_id = FIRST_APP_ID
+        while len(self.app_ids) < apps:
+            if synthetic_id not in self.recorded:
+                self.app_ids.append(synthetic_id)
+            synthetic_id += 1
+        self.names = {app_id: self._details(app_id).get("name", "") for app_id in self.app_ids}
+
+    def _glob(self, subdir):
+        directory = os.path.join(self.fixtures_dir, subdir)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json"))
+
+    def _fixture(self, *parts):
+        path = os.path.join(self.fixtures_dir, *parts)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _details(self, app_id):
+        result = self.recorded.get(app_id)
+        if result is not None:
+            return result.get("data") or {}
+        if app_id not in self._synthetic:
+            self._synthetic[app_id] = self._synthetic_details(app_id)
+        return self._synthetic[app_id]
+
+    def _synthetic_details(self, app_id):
+        rng = random.Random(self.seed * 1000003 + app_id)
+        is_free = rng.random() < 0.1
+        details = {
+            "type": "game",
+            "steam_appid": app_id,
+            "name": f"{' '.join(rng.sample(TITLE_WORDS, rng.randint(2, 3)))} {app_id % 1000}",
+            "is_free": is_free,
+            "short_description": f"Stub game {app_id}.",
+            "detailed_description": synthetic_description(rng),
+            "release_date": {"coming_soon": False, "date": f"{rng.randint(1, 28)} {rng.choice(['Jan', 'Mar', 'Jun', 'Sep', 'Nov'])}, {rng.randint(2008, 2024)}"},
+            "categories": [{"id": n, "description": category} for n, category in enumerate(rng.sample(CATEGORIES, rng.randint(1, 5)))],
+            "platforms": {"windows": True, "mac": rng.random() < 0.4, "linux": rng.random() < 0.3},
+            "header_image": f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/header.jpg",
+        }
+        if not is_free:
+            initial = rng.choice([499, 999, 1499, 1999, 2999, 3999, 5999, 6999])
+            discount = rng.choice([0, 0, 0, 10, 25, 50, 75])
+            details["price_overview"] = {
+                "currency": "USD",
+                "initial": initial,
+                "final": initial * (100 - discount) // 100,
+                "discount_percent": discount,
+            }
+        if rng.random() < 0.6:
+            details["metacritic"] = {"score": rng.randint(55, 97)}
+        return details
+
+    def most_played(self):
+        recorded = self._fixture("GetMostPlayedGames.json")
+        if recorded is not None:
+            return recorded
+        return {"response": {"ranks": [{"rank": rank, "appid": app_id} for rank, app_id in enumerate(self.app_ids, 1)]}}
+
+    def featured(self):
+        recorded = self._fixture("featured.json")
+        if recorded is not None:
+            return recorded
+        return {"featured_win": [{"id": app_id, "name": self.names[app_id]} for app_id in self.app_ids[:60]]}
+
+    def featured_categories(self):
+        recorded = self._fixture("featuredcategories.json")
+        if recorded is not None:
+            return recorded
+        specials = [app_id for app_id in self.app_ids if self._details(app_id).get("price_overview", {}).get("discount_percent")]
+        return {"specials": {"id": "cat_specials", "items": [{"id": app_id, "name": self.names[app_id]} for app_id in specials[:60]]}}
+
+    def search(self, term):
+        recorded = self._fixture("storesearch", f"{_term_key(term)}.json")
+        if recorded is not None:
+            return recorded
+        words = term.lower().split()
+        items = [
+            {"type": "app", "id": app_id, "name": name}
+            for app_id, name in self.names.items()
+            if all(word in name.lower() for word in words)
+        ][:50]
+        return {"total": len(items), "items": items}
+
+    def app_details(self, app_ids, price_only=False):
+        body = {}
+        for app_id in app_ids:
+            if app_id not in self.names and app_id not in self.recorded:
+                body[str(app_id)] = {"success": False}
+                continue
+            data = self._details(app_id)
+            if price_only:
+                # Steam answers free apps with an empty list instead of an object
+                data = {"price_overview": data["price_overview"]} if "price_overview" in data else []
+            body[str(app_id)] = {"success": True, "data": data}
+        return body
+
+    def news(self, app_id, count):
+        recorded = self._fixture("news", f"{app_id}.json")
+        if recorded is not None:
+            return recorded
+        rng = random.Random(self.seed * 7919 + app_id)
+        items = [
+            {
+                "gid": str(app_id * 100 + n),
+                "title": f"{self.names.get(app_id, 'Update')} patch {n}",
+                "url": f"https://store.steampowered.com/news/app/{app_id}/view/{n}",
+                "contents": synthetic_description(rng)[:500],
+                "date": 1700000000 - n * 86400,
+            }
+            for n in range(count)
+        ]
+        return {"appnews": {"appid": app_id, "newsitems": items, "count": len(items)}}
+
+
+class StubSteam:
+    """Threaded HTTP server answering Steam endpoints from a SteamCorpus
+
+    latency is the base delay of every response and jitter the mean of an
+    exponential tail added on top. error_rate and throttle_rate are the
+    fractions of requests answered with a random 5xx or a 429, and
+    rps_limit throttles sustained traffic above that many requests per
+    second the way Steam does. All of them can be changed while it runs.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.1, jitter=0.0, error_rate=0.0,
+                 throttle_rate=0.0, rps_limit=None, retry_after=1, corpus=None, apps=500, seed=7):
+        self.corpus = corpus or SteamCorpus(apps=apps, seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rps_limit = rps_limit
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._tokens = float(rps_limit or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.server = _Server((host, port), self._handler())
+        self.reset_stats()
+
+    @property
+    def app_ids(self):
+        return self.corpus.app_ids
+
+    @property
+    def api_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def store_url(self):
+        return f"{self.api_url}/api"
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = 0
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.by_path = {}
+            self.by_status = {}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "peak_in_flight": self.peak_in_flight,
+                "by_path": dict(self.by_path),
+                "by_status": dict(self.by_status),
+            }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="steam-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _plan(self):
+        """Draw this request's delay and injected failure, if any"""
+        with self._lock:
+            delay = self.latency + (self._rng.expovariate(1 / self.jitter) if self.jitter else 0)
+            if self.rps_limit:
+                now = time.monotonic()
+                self._tokens = min(float(self.rps_limit), self._tokens + (now - self._updated) * self.rps_limit)
+                self._updated = now
+                if self._tokens < 1:
+                    return delay, 429
+                self._tokens -= 1
+            roll = self._rng.random()
+            if roll < self.throttle_rate:
+                return delay, 429
+            if roll < self.throttle_rate + self.error_rate:
+                return delay, self._rng.choice((500, 502, 503))
+            return delay, None
+
+    def respond(self, path, query):
+        """Return (status, body) for one request"""
+        if path.endswith("/ISteamChartsService/GetMostPlayedGames/v1/"):
+            return 200, self.corpus.most_played()
+        if path.endswith("/ISteamNews/GetNewsForApp/v0002/"):
+            return 200, self.corpus.news(int(query.get("appid", ["0"])[0]), int(query.get("count", ["5"])[0]))
+        if path.endswith("/api/featured/"):
+            return 200, self.corpus.featured()
+        if path.endswith("/api/featuredcategories/"):
+            return 200, self.corpus.featured_categories()
+        if path.endswith("/api/storesearch/"):
+            return 200, self.corpus.search(query.get("term", [""])[0])
+        if path.endswith("/api/appdetails"):
+            app_ids = [int(app_id) for app_id in query.get("appids", [""])[0].split(",") if app_id.isdigit()]
+            price_only = query.get("filters", [""])[0] == "price_overview"
+            # Like Steam, only price lookups may ask for several apps at once
+            if not app_ids or (len(app_ids) > 1 and not price_only):
+                return 400, None
+            return 200, self.corpus.app_details(app_ids, price_only)
+        return 404, {"error": "not found"}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                    stub.by_path[url.path] = stub.by_path.get(url.path, 0) + 1
+                try:
+                    delay, failure = stub._plan()
+                    time.sleep(delay)
+                    if failure is None:
+                        status, body = stub.respond(url.path, parse_qs(url.query))
+                    else:
+                        status, body = failure, None
+                    with stub._lock:
+                        stub.by_status[status] = stub.by_status.get(status, 0) + 1
+                    payload = json.dumps(body).encode("utf-8")
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    if status == 429:
+                        self.send_header("Retry-After", str(stub.retry_after))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def record(fixtures_dir, apps, news, terms, delay):
+    """Save live Steam responses as a fixture corpus"""
+    import requests
+
+    session = requests.Session()
+
+    def fetch(url, params=None):
+        time.sleep(delay)
+        response = session.get(url, params=params, timeout=(3.05, 10))
+        response.raise_for_status()
+        return response.json()
+
+    def save(data, *parts):
+        path = os.path.join(fixtures_dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    most_played = fetch(f"{LIVE_API_URL}/ISteamChartsService/GetMostPlayedGames/v1/")
+    featured = fetch(f"{LIVE_STORE_URL}/featured/", {"l": "english"})
+    categories = fetch(f"{LIVE_STORE_URL}/featuredcategories/", {"l": "english"})
+    save(most_played, "GetMostPlayedGames.json")
+    save(featured, "featured.json")
+    save(categories, "featuredcategories.json")
+
+    app_ids = [rank.get("appid") for rank in most_played.get("response", {}).get("ranks", [])][:apps]
+    app_ids += [game.get("id") for game in featured.get("featured_win", [])]
+    app_ids += [game.get("id") for game in categories.get("specials", {}).get("items", [])]
+    app_ids = [app_id for app_id in dict.fromkeys(app_ids) if app_id]
+    for app_id in app_ids:
+        save(fetch(f"{LIVE_STORE_URL}/appdetails", {"appids": app_id, "l": "english"}), "appdetails", f"{app_id}.json")
+    for app_id in app_ids[:news]:
+        params = {"appid": app_id, "count": 10, "maxlength": 500, "format": "json"}
+        save(fetch(f"{LIVE_API_URL}/ISteamNews/GetNewsForApp/v0002/", params), "news", f"{app_id}.json")
+    for term in terms:
+        params = {"term": term, "l": "english", "cc": "US"}
+        save(fetch(f"{LIVE_STORE_URL}/storesearch/", params), "storesearch", f"{_term_key(term)}.json")
+    return len(app_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", nargs="?", choices=("serve", "record"), default="serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.1, help="Base seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Mean of the exponential delay added on top")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 5xx")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with a 429")
+    parser.add_argument("--rps-limit", type=float, default=None, help="Answer 429 above this many requests per second")
+    parser.add_argument("--apps", type=int, default=500, help="Apps in the corpus (serve) or top apps to record")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--news", type=int, default=20, help="Apps to record news for")
+    parser.add_argument("--terms", nargs="*", default=["counter", "dota", "battle", "simulator", "space"])
+    parser.add_argument("--delay", type=float, default=1.5, help="Seconds between live requests when recording")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        count = record(args.fixtures, args.apps, args.news, args.terms, args.delay)
+        print(f"Recorded {count} apps into {args.fixtures}")
+        return
+
+    stub = StubSteam(
+        args.host, args.port, args.latency, args.jitter, args.error_rate, args.throttle_rate,
+        args.rps_limit, corpus=SteamCorpus(args.fixtures, args.apps, args.seed), seed=args.seed,
+    )
+    print(f"Stub Steam API on {stub.api_url} (store {stub.store_url})")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ config = context.config
 fileConfig(config.config_file_name)
 logger = logging.getLogger('alembic.env')
 
+SEARCH_INDEX_OBJECTS = {'search_vector', 'ix_games_search_vector'}
+
 
 def get_engine():
     try:
@@ -90,9 +92,20 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # The full-text search column, index and FTS5 tables are created by hand
+    # in migrations and have no model counterpart, so autogenerate skips them
+    def include_object(object, name, type_, reflected, compare_to):
+        if reflected and compare_to is None and name in SEARCH_INDEX_OBJECTS:
+            return False
+        if type_ == 'table' and reflected and name.startswith('games_fts'):
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,30 @@
+"""steam catalog columns on games
+
+Revision ID: 3f1c9a7b2d4e
+Revises: decee2420d35
+Create Date: 2026-10-18 10:12:41.503127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7b2d4e'
+down_revision = 'decee2420d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('steam_appid', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('fetched_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_games_steam_appid'), ['steam_appid'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_games_steam_appid'))
+        batch_op.drop_column('fetched_at')
+        batch_op.drop_column('steam_appid')
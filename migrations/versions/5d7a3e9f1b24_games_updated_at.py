@@ -0,0 +1,25 @@
+"""updated_at on games for collection validators
+
+Revision ID: 5d7a3e9f1b24
+Revises: 8b2e4d1c6a90
+Create Date: 2026-10-18 16:40:12.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7a3e9f1b24'
+down_revision = '8b2e4d1c6a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Not batch_alter_table: rebuilding games on SQLite would drop the games_fts triggers
+    op.add_column('games', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('games', 'updated_at')
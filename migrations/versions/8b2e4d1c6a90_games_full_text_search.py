@@ -0,0 +1,66 @@
+"""full-text search index on games
+
+Revision ID: 8b2e4d1c6a90
+Revises: 3f1c9a7b2d4e
+Create Date: 2026-10-18 14:05:12.318804
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d1c6a90'
+down_revision = '3f1c9a7b2d4e'
+branch_labels = None
+depends_on = None
+
+FTS_COLUMNS = "title, category, platform, description"
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Title outranks category, platform and description in ts_rank
+        op.execute(
+            "ALTER TABLE games ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(platform, '')), 'C') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'D')) STORED"
+        )
+        op.create_index('ix_games_search_vector', 'games', ['search_vector'], postgresql_using='gin')
+    elif dialect == 'sqlite':
+        op.execute(
+            f"CREATE VIRTUAL TABLE games_fts USING fts5({FTS_COLUMNS}, content='games', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER games_fts_ai AFTER INSERT ON games BEGIN "
+            f"INSERT INTO games_fts(rowid, {FTS_COLUMNS}) "
+            "VALUES (new.id, new.title, new.category, new.platform, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER games_fts_ad AFTER DELETE ON games BEGIN "
+            f"INSERT INTO games_fts(games_fts, rowid, {FTS_COLUMNS}) "
+            "VALUES ('delete', old.id, old.title, old.category, old.platform, old.description); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER games_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON games BEGIN "
+            f"INSERT INTO games_fts(games_fts, rowid, {FTS_COLUMNS}) "
+            "VALUES ('delete', old.id, old.title, old.category, old.platform, old.description); "
+            f"INSERT INTO games_fts(rowid, {FTS_COLUMNS}) "
+            "VALUES (new.id, new.title, new.category, new.platform, new.description); END"
+        )
+        op.execute("INSERT INTO games_fts(games_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_games_search_vector', table_name='games', postgresql_using='gin')
+        op.execute("ALTER TABLE games DROP COLUMN search_vector")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS games_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS games_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS games_fts_ai")
+        op.execute("DROP TABLE IF EXISTS games_fts")
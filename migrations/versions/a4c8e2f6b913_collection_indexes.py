@@ -0,0 +1,36 @@
+"""per-user time-ordered and foreign key indexes for collections and orders
+
+Revision ID: a4c8e2f6b913
+Revises: 5d7a3e9f1b24
+Create Date: 2026-10-18 17:52:41.506127
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f6b913'
+down_revision = '5d7a3e9f1b24'
+branch_labels = None
+depends_on = None
+
+# Trailing id lets keyset pages seek and order straight from the index
+INDEXES = [
+    ('ix_user_library_user_id_added_at', 'user_library', ['user_id', 'added_at', 'id']),
+    ('ix_user_library_game_id', 'user_library', ['game_id']),
+    ('ix_wishlist_items_user_id_created_at', 'wishlist_items', ['user_id', 'created_at', 'id']),
+    ('ix_wishlist_items_game_id', 'wishlist_items', ['game_id']),
+    ('ix_orders_user_id_order_date', 'orders', ['user_id', 'order_date']),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_order_items_game_id', 'order_items', ['game_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
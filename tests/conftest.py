@@ -0,0 +1,86 @@
+import itertools
+import os
+from contextlib import contextmanager
+
+import pytest
+from flask_jwt_extended import create_access_token
+from flask_migrate import upgrade
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models.game import Game
+from app.models.user_library import UserLibrary
+from app.models.wishlist_item import WishlistItem
+from app.services.auth_service import AuthService
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+_usernames = (f"tester{n}" for n in itertools.count())
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    # One app per session: flask-admin's views can only be registered on a single app per process
+    workdir = tmp_path_factory.mktemp("app")
+    app = create_app("testing", {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{workdir / 'test.sqlite3'}",
+        "JWT_SECRET_KEY": "test-only-signing-key-0123456789abcdef",
+    })
+    # Migrations rather than create_all, so the schema has the full-text index and every index
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def make_user(app):
+    """Create a user owning library_size games and wishlisting wishlist_size others; returns (user_id, auth headers)"""
+
+    def make(library_size=0, wishlist_size=0, admin=False):
+        username = next(_usernames)
+        with app.app_context():
+            user = AuthService.register(f"{username}@example.com", username, "Test", "User", "US", "test-password")
+            user.is_admin = admin
+            games = [
+                Game(title=f"{username} game {n}", price=19.99, release_year=2020, status="Available",
+                     category="Action", description="A description.", platform="Windows")
+                for n in range(library_size + wishlist_size)
+            ]
+            db.session.add_all(games)
+            db.session.flush()
+            db.session.add_all(UserLibrary(user_id=user.id, game_id=game.id) for game in games[:library_size])
+            db.session.add_all(WishlistItem(user_id=user.id, game_id=game.id) for game in games[library_size:])
+            db.session.commit()
+            claims = {"username": username, **AuthService.role_claims(user)}
+            token = create_access_token(identity=str(user.id), additional_claims=claims)
+            return user.id, {"Authorization": f"Bearer {token}"}
+
+    return make
+
+
+@pytest.fixture
+def statements(app):
+    """Record the SQL statements the app executes inside `with statements() as executed:`"""
+
+    @contextmanager
+    def capture():
+        executed = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            executed.append((statement, parameters))
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield executed
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return capture
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.async_steam_service import AsyncSteamService
+from app.services.steam_service import GameRecord
+from app.utils.cache import SQLiteCache
+from app.utils.rate_limiter import RateLimiter, SQLiteTokenBucket
+
+
+class RecordingCache(SQLiteCache):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get_entry(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get_entry(key)
+
+    def get_many_entries(self, keys):
+        self.threads.append(threading.get_ident())
+        return super().get_many_entries(keys)
+
+
+class RecordingBucket(SQLiteTokenBucket):
+    threads = []
+
+    def _reserve(self, max_wait):
+        self.threads.append(threading.get_ident())
+        return super()._reserve(max_wait)
+
+
+@pytest.fixture
+def sqlite_backends(app, tmp_path, monkeypatch):
+    cache = RecordingCache(str(tmp_path / "cache.sqlite3"))
+    limiter = RateLimiter({
+        budget: RecordingBucket(budget, 1000, 1000, str(tmp_path / "buckets.sqlite3")) for budget in ("api", "store")
+    })
+    monkeypatch.setitem(app.extensions, "steam_cache", cache)
+    monkeypatch.setitem(app.extensions, "steam_rate_limiter", limiter)
+    RecordingBucket.threads = []
+    return cache
+
+
+def test_sqlite_cache_and_buckets_are_called_off_the_event_loop(app, sqlite_backends):
+    cache = sqlite_backends
+    record = GameRecord(10, "Cached", "$1.99", 2020, "Available", "Action", "", "Windows", None, None)
+    cache.set("10", record, 60, 60)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        service = AsyncSteamService()
+        records = await service.get_many_game_records([10])
+        await service.get_game_record(10)
+        await service._throttle("store")
+        return loop_thread, records
+
+    with app.app_context():
+        loop_thread, records = asyncio.run(run())
+
+    assert [r.title for r in records] == ["Cached"]
+    assert cache.threads and loop_thread not in cache.threads
+    assert RecordingBucket.threads and loop_thread not in RecordingBucket.threads
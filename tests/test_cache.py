@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from app.utils.cache import SQLiteCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=100, max_bytes=10_000)
+
+
+def stored(cache):
+    conn = cache._connect()
+    return conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+
+
+def test_running_totals_follow_inserts_updates_and_deletes(cache):
+    cache.set("a", "x" * 100, 60)
+    cache.set("b", "y" * 50, 60)
+    cache.set("a", "z" * 10, 60)
+    cache.delete("b")
+
+    conn = cache._connect()
+    assert conn.execute("SELECT entries, bytes FROM cache_stats").fetchone() == stored(cache)
+
+
+def test_byte_limit_evicts_least_recently_used_in_one_batch(cache):
+    for n in range(60):
+        cache.set(f"key{n}", "x" * 398, 60)  # 400 bytes once JSON-encoded
+        time.sleep(0.001)
+
+    count, total = stored(cache)
+    assert total <= cache.max_bytes
+    assert cache.get("key59") is not None
+    assert cache.get("key0") is None
+
+
+def test_entry_limit_evicts_least_recently_used(cache):
+    for n in range(150):
+        cache.set(f"key{n}", n, 60)
+
+    count, _ = stored(cache)
+    assert count <= cache.max_entries
+    assert cache.get("key149") == 149
+    assert cache.get("key0") is None
+
+
+class CountingConnection:
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = 0
+
+    def execute(self, *args):
+        self.statements += 1
+        return self.conn.execute(*args)
+
+
+def test_write_at_the_limit_runs_a_constant_number_of_statements(cache):
+    for n in range(60):
+        cache.set(f"key{n}", "x" * 398, 60)
+
+    counting = cache._local.conn = CountingConnection(cache._connect())
+    for n in range(60, 80):
+        counting.statements = 0
+        cache.set(f"key{n}", "x" * 398, 60)
+        # Upsert, totals lookup, and when over a limit the expired sweep and one ranked delete
+        assert counting.statements <= 4
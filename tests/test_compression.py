@@ -0,0 +1,77 @@
+import gzip
+
+from flask import Response
+
+from app.utils.conditional import conditional_response
+
+BODY = b'{"data": "' + b"x" * 4096 + b'"}'
+
+
+def test_streamed_response_gets_an_encoding_specific_etag(app):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = Response(iter([BODY[:100], BODY[100:]]), mimetype="application/json")
+        response.set_etag("abc")
+
+        response = app.process_response(response)
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.get_etag() == ("abc-gzip", False)
+        assert gzip.decompress(b"".join(response.response)) == BODY
+
+
+def test_buffered_response_gets_an_encoding_specific_etag(app):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = Response(BODY, mimetype="application/json")
+        response.set_etag("abc")
+
+        response = app.process_response(response)
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.get_etag() == ("abc-gzip", False)
+        assert gzip.decompress(response.get_data()) == BODY
+
+
+def test_identity_response_keeps_its_etag(app):
+    with app.test_request_context(headers={"Accept-Encoding": "identity"}):
+        response = Response(iter([BODY]), mimetype="application/json")
+        response.set_etag("abc")
+
+        response = app.process_response(response)
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_etag() == ("abc", False)
+
+
+def test_not_modified_keeps_the_encoding_specific_etag(app):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc-gzip"'}):
+        app.preprocess_request()
+        response = conditional_response("abc", lambda: BODY)
+
+        response = app.process_response(response)
+
+        assert response.status_code == 304
+        assert response.get_etag() == ("abc-gzip", False)
+        assert "Accept-Encoding" in response.vary
+
+
+def test_not_modified_for_an_identity_copy_keeps_the_plain_etag(app):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc"'}):
+        app.preprocess_request()
+        response = conditional_response("abc", lambda: BODY)
+
+        response = app.process_response(response)
+
+        assert response.status_code == 304
+        assert response.get_etag() == ("abc", False)
+
+
+def test_revalidating_a_compressed_listing_round_trips_its_etag(client, make_user):
+    user_id, headers = make_user(library_size=20)
+    path = f"/api/user/{user_id}/library"
+    first = client.get(path, headers={**headers, "Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+
+    second = client.get(path, headers={**headers, "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
@@ -0,0 +1,63 @@
+import pytest
+
+from app.models.user import User
+
+ENDPOINTS = {
+    "library": "/api/user/{user_id}/library",
+    "wishlist": "/api/wishlist_items/user/{user_id}/wishlist",
+}
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_repeat_poll_gets_304_without_loading_the_collection(client, make_user, statements, endpoint):
+    user_id, headers = make_user(library_size=5, wishlist_size=5)
+    path = ENDPOINTS[endpoint].format(user_id=user_id)
+    etag = client.get(path, headers=headers).headers["ETag"]
+
+    with statements() as executed:
+        response = client.get(path, headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    # Only the page validator runs; the listing would select the games' columns
+    assert len(executed) == 1
+    assert "games.title" not in executed[0][0]
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_collection_change_invalidates_the_etag(client, make_user, endpoint):
+    user_id, headers = make_user(library_size=2, wishlist_size=2)
+    path = ENDPOINTS[endpoint].format(user_id=user_id)
+    etag = client.get(path, headers=headers).headers["ETag"]
+
+    game_id = client.get(path, headers=headers).get_json()["data"][0]["game"]["id"]
+    assert client.delete(f"{path}/game/{game_id}", headers=headers).status_code == 200
+
+    response = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_me_answers_304_before_serializing(client, make_user, monkeypatch):
+    _, headers = make_user()
+    etag = client.get("/api/user/me", headers=headers).headers["ETag"]
+
+    def fail(self):
+        raise AssertionError("serialized for a 304")
+
+    monkeypatch.setattr(User, "serialize", fail)
+    response = client.get("/api/user/me", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.get_data() == b""
+
+
+def test_me_etag_follows_user_changes(client, make_user):
+    user_id, headers = make_user()
+    etag = client.get("/api/user/me", headers=headers).headers["ETag"]
+
+    client.put(f"/api/user/{user_id}", headers=headers, json={"username": f"renamed{user_id}"})
+
+    response = client.get("/api/user/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,35 @@
+import pytest
+
+from app.utils.html_sanitizer import sanitize_html_description
+from benchmarks.bench_sanitizer import legacy_sanitize_html_description
+
+# (description, old output, new output); the old output is pinned too, so each row shows what changed
+CASES = {
+    "heading": ('<h2 class="bb_tag">Title</h2>Body', "Title\nBody", "Title\nBody"),
+    "paragraphs": ("<p>One</p><p>Two</p>", "One\nTwo", "One\nTwo"),
+    "list": ('<ul class="bb_ul"><li>A</li><li>B</li></ul>', "• A\n• B", "• A\n• B"),
+    "attributes": ('<a href="https://example.com" target="_blank">Link</a> <img src="x.gif" />', "Link", "Link"),
+    "inline tags": ("<div><span><strong>Bold</strong></span></div>", "Bold", "Bold"),
+    "uppercase br": ("a<br>b<BR/>c", "a\nbc", "a\nb\nc"),
+    "li prefix": ('<link rel="x">Text', "• Text", "Text"),
+    "basic entities": ("Fish &amp; Chips &quot;Hi&quot; &#39;x&#39; &lt;3", "Fish & Chips \"Hi\" 'x' <3", "Fish & Chips \"Hi\" 'x' <3"),
+    "named entities": ("Now &mdash; later &hellip;", "Now &mdash; later &hellip;", "Now — later …"),
+    "numeric entities": ("&#8212; &#x2014;", "&#8212; &#x2014;", "— —"),
+    "escaped entity": ("&amp;lt;b&amp;gt;", "<b>", "&lt;b&gt;"),
+    "nbsp entity": ("a&nbsp;b", "a b", "a b"),
+    "nbsp character": ("a\xa0b", "a\xa0b", "a b"),
+    "blank lines": ("a\n\n\n\nb", "a\n\nb", "a\n\nb"),
+    "surrounding whitespace": ("  <br>  padded  <br>  ", "padded", "padded"),
+    "empty": ("", "", ""),
+}
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_sanitizer_output_against_the_old_sanitizer(case):
+    description, old, new = CASES[case]
+    assert legacy_sanitize_html_description(description) == old
+    assert sanitize_html_description(description) == new
+
+
+def test_none_is_empty():
+    assert sanitize_html_description(None) == ""
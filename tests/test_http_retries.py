@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+from app.services.async_steam_service import AsyncSteamService
+from app.services import steam_service
+from app.services.steam_service import SteamService
+from app.utils.http_client import HttpClient
+from app.utils.rate_limiter import RateLimiter, TokenBucket
+
+URL = "https://store.example.com/appdetails"
+
+
+def sync_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.url = URL
+    response._content = b'{"ok": true}'
+    return response
+
+
+class ScriptedClient:
+    def __init__(self, responses, retries=3):
+        self.responses = list(responses)
+        self.retries = retries
+        self.backoff = 0.3
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__("store", 1000, 1000)
+        self.reserved = 0
+
+    def _reserve(self, max_wait):
+        self.reserved += 1
+        return super()._reserve(max_wait)
+
+
+@pytest.fixture
+def steam(app, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(steam_service.time, "sleep", sleeps.append)
+    with app.app_context():
+        service = SteamService()
+    service.rate_limiter = RateLimiter({"store": CountingBucket()})
+    service.sleeps = sleeps
+    return service
+
+
+def test_throttled_requests_are_retried_through_the_rate_limiter(steam):
+    steam.http = ScriptedClient([sync_response(429, {"Retry-After": "2"}), sync_response(429), sync_response(200)])
+
+    assert steam._get_json("store", URL) == {"ok": True}
+    assert steam.http.calls == 3
+    assert steam.rate_limiter.buckets["store"].reserved == 3
+    # Retry-After when the server sends one, the backoff otherwise
+    assert steam.sleeps == [2.0, 0.6]
+
+
+def test_retry_after_past_the_max_wait_is_not_retried(steam):
+    steam.http = ScriptedClient([sync_response(429, {"Retry-After": "3600"}), sync_response(200)])
+
+    with pytest.raises(requests.HTTPError):
+        steam._get_json("store", URL)
+    assert steam.http.calls == 1
+    assert steam.sleeps == []
+
+
+def test_throttling_gives_up_after_the_configured_retries(steam):
+    steam.http = ScriptedClient([sync_response(429, {"Retry-After": "0"})] * 2, retries=1)
+
+    with pytest.raises(requests.HTTPError):
+        steam._get_json("store", URL)
+    assert steam.rate_limiter.buckets["store"].reserved == 2
+
+
+def test_async_throttled_requests_are_retried_through_the_rate_limiter(app, monkeypatch):
+    responses = [httpx.Response(429, headers={"Retry-After": "0"}, request=httpx.Request("GET", URL)),
+                 httpx.Response(200, json={"ok": True}, request=httpx.Request("GET", URL))]
+
+    class ScriptedAsyncClient(ScriptedClient):
+        async def get(self, url, params=None):
+            return ScriptedClient.get(self, url, params)
+
+    with app.app_context():
+        service = AsyncSteamService()
+    bucket = CountingBucket()
+    service.steam.rate_limiter = RateLimiter({"store": bucket})
+    service._blocking_limiter = False
+    service.http = ScriptedAsyncClient(responses)
+
+    assert asyncio.run(service._get_json("store", URL)) == {"ok": True}
+    assert bucket.reserved == 2
+
+
+def test_pooled_client_leaves_429_to_the_caller():
+    retry = HttpClient().session.get_adapter("https://").max_retries
+    assert 429 not in retry.status_forcelist
+    assert 503 in retry.status_forcelist
@@ -0,0 +1,52 @@
+def test_me_loads_the_user_and_profile_in_one_query(client, make_user, statements):
+    user_id, headers = make_user()
+
+    with statements() as executed:
+        response = client.get("/api/user/me", headers=headers)
+
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    assert data["id"] == user_id
+    assert data["profile"]["user_id"] == user_id
+    assert len(executed) == 1
+    assert "JOIN profiles" in executed[0][0]
+
+
+def test_check_auth_reads_the_token_user(client, make_user, statements):
+    user_id, headers = make_user()
+
+    with statements() as executed:
+        response = client.get("/api/user/check-auth", headers=headers)
+
+    assert response.get_json()["user_id"] == user_id
+    assert len(executed) == 1
+
+
+def test_deactivated_user_is_refused_by_me(client, make_user):
+    user_id, headers = make_user()
+    assert client.patch(f"/api/user/{user_id}/deactivate", headers=headers).status_code == 200
+
+    response = client.get("/api/user/me", headers=headers)
+
+    assert response.status_code == 403
+
+
+def test_routes_that_never_read_the_user_do_not_load_it(client, make_user, statements):
+    user_id, headers = make_user(library_size=2)
+
+    with statements() as executed:
+        client.get(f"/api/user/{user_id}/library", headers=headers)
+
+    assert not any("FROM users" in statement for statement, _ in executed)
+
+
+def test_profile_update_loads_the_user_once_before_writing(client, make_user, statements):
+    user_id, headers = make_user()
+
+    with statements() as executed:
+        response = client.put(f"/api/user/{user_id}", headers=headers, json={"username": f"changed{user_id}"})
+
+    assert response.status_code == 200
+    user_selects = [s for s, _ in executed if s.lstrip().startswith("SELECT") and "FROM users" in s]
+    # The identity load, the username uniqueness check and one joined reload for the response
+    assert len(user_selects) == 3
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.game import Game
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.repositories.library import LibraryRepository
+from app.repositories.wishlist_item import WishlistItemRepository
+
+# A key from the middle of a collection, as a followed cursor would carry
+CURSOR = (datetime(2026, 1, 1), 50)
+
+QUERIES = {
+    "library_first_page": (lambda user_id, game_id: LibraryRepository.get_user_library(user_id, 50),
+                           "user_library", "ix_user_library_user_id_added_at"),
+    "library_next_page": (lambda user_id, game_id: LibraryRepository.get_user_library(user_id, 50, CURSOR),
+                          "user_library", "ix_user_library_user_id_added_at"),
+    "library_oldest_page": (lambda user_id, game_id: LibraryRepository.get_user_library(user_id, 50, CURSOR, descending=False),
+                            "user_library", "ix_user_library_user_id_added_at"),
+    "library_page_version": (lambda user_id, game_id: LibraryRepository.get_user_library_page_version(user_id, 50, CURSOR),
+                             "user_library", "ix_user_library_user_id_added_at"),
+    "library_item": (lambda user_id, game_id: LibraryRepository.get_library_item(user_id, game_id),
+                     "user_library", "sqlite_autoindex_user_library_1"),
+    "wishlist_first_page": (lambda user_id, game_id: WishlistItemRepository.get_user_wishlist(user_id, 50),
+                            "wishlist_items", "ix_wishlist_items_user_id_created_at"),
+    "wishlist_next_page": (lambda user_id, game_id: WishlistItemRepository.get_user_wishlist(user_id, 50, CURSOR),
+                           "wishlist_items", "ix_wishlist_items_user_id_created_at"),
+    "wishlist_page_version": (lambda user_id, game_id: WishlistItemRepository.get_user_wishlist_page_version(user_id, 50, CURSOR),
+                              "wishlist_items", "ix_wishlist_items_user_id_created_at"),
+    "order_history": (lambda user_id, game_id: db.session.execute(
+                          select(Order).where(Order.user_id == user_id).order_by(Order.order_date.desc()).limit(20)).all(),
+                      "orders", "ix_orders_user_id_order_date"),
+    "order_items_of_order": (lambda user_id, game_id: db.session.execute(
+                                 select(OrderItem).where(OrderItem.order_id == 1)).all(),
+                             "order_items", "ix_order_items_order_id"),
+    "order_items_of_game": (lambda user_id, game_id: db.session.execute(
+                                select(OrderItem).where(OrderItem.game_id == game_id)).all(),
+                            "order_items", "ix_order_items_game_id"),
+}
+
+
+@pytest.fixture(scope="module")
+def seeded(app, make_user):
+    user_id, _ = make_user(library_size=100, wishlist_size=100)
+    with app.app_context():
+        game_ids = [game_id for (game_id,) in db.session.query(Game.id).limit(3)]
+        for _ in range(20):
+            order = Order(user_id=user_id, total_amount=59.97, status="Completed")
+            order.order_items = [OrderItem(game_id=game_id, quantity=1, price=19.99) for game_id in game_ids]
+            db.session.add(order)
+        db.session.commit()
+        db.session.execute(db.text("ANALYZE"))
+    return user_id, game_ids[0]
+
+
+@pytest.mark.parametrize("name", QUERIES)
+def test_hot_query_uses_its_index(app, seeded, statements, name):
+    run, table, index = QUERIES[name]
+    user_id, game_id = seeded
+
+    with app.app_context():
+        if db.engine.dialect.name != "sqlite":
+            pytest.skip("plans are checked with SQLite's EXPLAIN QUERY PLAN")
+        with statements() as executed:
+            run(user_id, game_id)
+        plan = [
+            row[-1]
+            for statement, parameters in executed
+            for row in db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        ]
+
+    assert any(index in line for line in plan), plan
+    # "SCAN t" alone reads the whole table; "SCAN t USING ... INDEX" walks an index in order
+    assert f"SCAN {table}" not in plan, plan
+    assert not any(line.startswith("USE TEMP B-TREE") for line in plan), plan
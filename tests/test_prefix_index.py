@@ -0,0 +1,79 @@
+from app.services.suggest_service import CatalogSuggestions, popularity
+from app.utils.prefix_index import PrefixIndex
+
+
+def ids(results):
+    return [item_id for item_id, _ in results]
+
+
+def test_prefix_matches_any_word_ranked_by_score():
+    index = PrefixIndex()
+    index.add(1, "Counter-Strike 2", 990)
+    index.add(2, "Stardew Valley", 9.5)
+    index.add(3, "Street Fighter 6", 8.0)
+    index.add(4, "Portal", 9.0)
+
+    assert ids(index.search("st")) == [1, 2, 3]
+    assert ids(index.search("st", k=2)) == [1, 2]
+    assert ids(index.search("PORT")) == [4]
+    assert index.search("zelda") == []
+    assert index.search("  ") == []
+
+
+def test_multi_word_query_ranks_titles_with_it_as_typed_first():
+    index = PrefixIndex()
+    index.add(1, "Valley of the Dead", 50)
+    index.add(2, "Stardew Valley", 10)
+    index.add(3, "Dead Valley", 5)
+
+    # "dead valley" as typed beats higher-scored titles with the words in another order
+    assert ids(index.search("dead val")) == [3, 1]
+    assert ids(index.search("valley st")) == [2]
+
+
+def test_replacing_an_item_re_ranks_it():
+    index = PrefixIndex()
+    index.add(1, "Portal", 9.0)
+    index.add(2, "Portal 2", 9.5)
+    assert ids(index.search("por")) == [2, 1]
+
+    index.add(1, "Portal", 995)
+    assert ids(index.search("por")) == [1, 2]
+    assert len(index) == 2
+
+
+def test_renamed_and_removed_items_leave_their_old_prefixes():
+    index = PrefixIndex()
+    index.add(1, "Half-Life", 9.6)
+    index.add(2, "Halo Infinite", 8.0)
+
+    index.add(1, "Black Mesa", 9.0)
+    assert ids(index.search("hal")) == [2]
+    assert ids(index.search("mesa")) == [1]
+
+    index.remove(2)
+    assert index.search("hal") == []
+    assert 2 not in index
+
+
+def test_removal_refills_the_top_list_from_below_the_cut_off():
+    index = PrefixIndex(max_k=2)
+    for item_id, score in ((1, 30), (2, 20), (3, 10)):
+        index.add(item_id, f"Space Game {item_id}", score)
+    assert ids(index.search("space")) == [1, 2]
+
+    index.remove(1)
+    assert ids(index.search("space")) == [2, 3]
+
+
+def test_detail_fetch_keeps_the_synced_chart_rank():
+    suggestions = CatalogSuggestions(sync_interval=300)
+    suggestions._ranks = {730: 0}
+    suggestions.add_game({"id": 730, "title": "Counter-Strike 2", "rating": 8.1}, rank=0)
+    suggestions.add_game({"id": 620, "title": "Counter Force", "rating": 9.5})
+
+    # A later detail fetch of 730 carries no rank
+    suggestions.add_game({"id": 730, "title": "Counter-Strike 2", "rating": 8.1})
+
+    assert ids(suggestions.index.search("counter")) == [730, 620]
+    assert suggestions.index._items[730][1] == popularity(8.1, 0)
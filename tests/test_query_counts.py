@@ -0,0 +1,25 @@
+import pytest
+
+# The validator query plus the listing itself; the ownership check needs no query
+QUERY_BUDGET = 2
+
+ENDPOINTS = {
+    "library": "/api/user/{user_id}/library",
+    "wishlist": "/api/wishlist_items/user/{user_id}/wishlist",
+}
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_listing_query_count_does_not_grow_with_the_collection(client, make_user, statements, endpoint):
+    counts = {}
+    for size in (3, 120):
+        user_id, headers = make_user(library_size=size, wishlist_size=size)
+        with statements() as executed:
+            response = client.get(ENDPOINTS[endpoint].format(user_id=user_id), headers=headers,
+                                  query_string={"limit": 200})
+        assert response.status_code == 200
+        assert len(response.get_json()["data"]) == size
+        counts[size] = len(executed)
+
+    assert counts[120] == counts[3]
+    assert counts[120] <= QUERY_BUDGET
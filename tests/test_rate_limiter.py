@@ -0,0 +1,74 @@
+import pytest
+
+from app.services import catalog_warmer
+from app.services.steam_service import SteamService
+from app.utils import rate_limiter
+from app.utils.rate_limiter import RateLimitExceeded, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+def test_burst_is_served_without_waiting(clock):
+    bucket = TokenBucket("store", rate=2, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # The fourth caller queues behind the burst for one token's worth of refill
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_at_the_rate_up_to_the_burst(clock):
+    bucket = TokenBucket("store", rate=2, burst=3)
+    for _ in range(3):
+        bucket.reserve()
+
+    clock.now += 1
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() > 0
+
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0
+
+
+def test_reservation_past_max_wait_is_rejected_without_spending_a_token(clock):
+    bucket = TokenBucket("store", rate=1, burst=1, max_wait=2)
+    bucket.reserve()
+    bucket.reserve()
+    assert bucket.reserve() == pytest.approx(2.0)
+
+    with pytest.raises(RateLimitExceeded):
+        bucket.reserve()
+    # A per-call deadline overrides the bucket's
+    assert bucket.reserve(max_wait=10) == pytest.approx(3.0)
+
+    stats = bucket.stats()
+    assert (stats["acquired"], stats["rejected"], stats["waited"]) == (4, 1, 3)
+    assert stats["total_wait"] == pytest.approx(6.0)
+    assert stats["max_wait"] == pytest.approx(3.0)
+
+
+def test_warm_command_reports_rate_limit_stats(app, monkeypatch):
+    monkeypatch.setattr(SteamService, "warm_listings", lambda self, top, size: {"refreshed": 3, "errors": 0})
+    app.extensions["steam_rate_limiter"].acquire("store")
+
+    result = app.test_cli_runner().invoke(catalog_warmer.warm_command)
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].startswith("refreshed=3 errors=0")
+    assert any(line.startswith("rate_limit[store] acquired=") for line in lines)
+    assert any(line.startswith("rate_limit[api] acquired=") for line in lines)
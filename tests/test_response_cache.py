@@ -0,0 +1,81 @@
+import pytest
+
+from app.services.steam_service import GameRecord
+from app.utils import cache as cache_module
+from app.utils.cache import MemoryCache, SQLiteCache
+from app.utils.response_cache import ResponseCache
+
+
+def record(app_id, price="$9.99"):
+    return GameRecord(app_id, f"Game {app_id}", price, 2020, "Available", "Action", "A description.", "Windows", 4.5, None)
+
+
+def test_body_is_reused_only_at_the_version_it_was_stored_under(app):
+    responses = ResponseCache()
+    with app.app_context():
+        stored = responses.put("top", ((1, 2), (11, 12)), [record(1).to_dict(), record(2).to_dict()])
+
+        assert responses.get("top", ((1, 2), (11, 12))) is stored
+        assert responses.get("top", ((1, 2), (11, 13))) is None
+        assert responses.get("top", ((2, 1), (12, 11))) is None
+
+        replaced = responses.put("top", ((1, 2), (11, 13)), [record(1).to_dict(), record(2, "$4.99").to_dict()])
+    assert replaced.etag != stored.etag
+    assert responses.get("top", ((1, 2), (11, 12))) is None
+    assert responses._bytes == len(replaced.body)
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_cache_versions_change_with_each_write(tmp_path, backend):
+    cache = MemoryCache() if backend == "memory" else SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("1", record(1), 60, 60)
+    cache.set("2", record(2), 60, 0)
+
+    versions = cache.get_many_versions(["1", "2", "3"])
+    assert set(versions) == {"1", "2"}
+    assert versions["2"][1] <= versions["1"][1]
+
+    cache.set("1", record(1, "$4.99"), 60, 60)
+    assert cache.get_many_versions(["1"])["1"][0] != versions["1"][0]
+    assert cache.get_many_versions(["2"])["2"][0] == versions["2"][0]
+
+
+@pytest.fixture
+def sqlite_cache(app, tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setitem(app.extensions, "steam_cache", cache)
+    monkeypatch.setitem(app.extensions, "steam_response_cache", ResponseCache())
+    return cache
+
+
+def test_unchanged_details_are_sent_without_decoding_the_cached_records(client, sqlite_cache, monkeypatch):
+    sqlite_cache.set("4100", record(4100), 3600, 600)
+    first = client.get("/api/steam/games/4100")
+    assert first.get_json()["title"] == "Game 4100"
+
+    decoded = []
+    loads = cache_module.json.loads
+    monkeypatch.setattr(cache_module.json, "loads", lambda value: decoded.append(value) or loads(value))
+    again = client.get("/api/steam/games/4100")
+
+    assert again.get_data() == first.get_data()
+    assert decoded == []
+
+    sqlite_cache.set("4100", record(4100, "$4.99"), 3600, 600)
+    changed = client.get("/api/steam/games/4100")
+    assert changed.get_json()["price"] == "$4.99"
+    assert changed.headers["ETag"] != first.headers["ETag"]
+
+
+def test_listing_is_re_encoded_when_one_of_its_apps_changes(client, sqlite_cache):
+    sqlite_cache.set("top_game_ids", [4201, 4202], 3600, 600)
+    for app_id in (4201, 4202):
+        sqlite_cache.set(str(app_id), record(app_id), 3600, 600)
+    first = client.get("/api/steam/top-games?limit=2")
+    assert [game["id"] for game in first.get_json()] == [4201, 4202]
+    assert client.get("/api/steam/top-games?limit=2").headers["ETag"] == first.headers["ETag"]
+
+    sqlite_cache.set("4202", record(4202, "$1.99"), 3600, 600)
+    changed = client.get("/api/steam/top-games?limit=2")
+    assert changed.get_json()[1]["price"] == "$1.99"
+    assert changed.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,76 @@
+import asyncio
+import unicodedata
+
+import pytest
+
+from app.services.steam_service import SteamService
+
+
+@pytest.fixture
+def steam(app, monkeypatch):
+    """A SteamService whose storesearch calls and catalog lookups are recorded instead of sent"""
+    with app.app_context():
+        service = SteamService()
+        sent = {"storesearch": [], "catalog": []}
+
+        def fake_get_json(budget, url, params=None):
+            sent["storesearch"].append(params["term"])
+            return {"items": []}
+
+        def fake_search_catalog(query, limit):
+            sent["catalog"].append(query)
+            return None
+
+        monkeypatch.setattr(service, "_get_json", fake_get_json)
+        monkeypatch.setattr(service, "_search_catalog", fake_search_catalog)
+        service.cache.clear()
+        yield service, sent
+
+
+@pytest.mark.parametrize("query, sent_term, cache_key", [
+    ("ガンダム", "ガンダム", "search_カンタム"),
+    # Precomposed syllables go upstream; the key holds the jamo normalize_text decomposes them into
+    ("포탈", "포탈", "search_" + unicodedata.normalize("NFKD", "포탈")),
+    ("C++ game", "C++ game", "search_c game"),
+    ("  Ｐｏｒｔａｌ   2 ", "Portal 2", "search_portal 2"),
+])
+def test_search_sends_query_as_typed_and_folds_only_the_cache_key(steam, query, sent_term, cache_key):
+    service, sent = steam
+
+    service.search_games(query)
+
+    assert sent["catalog"] == [sent_term]
+    assert sent["storesearch"] == [sent_term]
+    assert service.cache.get_entry(cache_key) is not None
+
+
+def test_blank_search_sends_nothing(steam):
+    service, sent = steam
+
+    assert service.search_games("   ") == []
+    assert sent == {"storesearch": [], "catalog": []}
+
+
+def test_async_search_sends_query_as_typed(app, monkeypatch):
+    from app.services.async_steam_service import AsyncSteamService
+
+    with app.app_context():
+        service = AsyncSteamService()
+        sent = {"storesearch": [], "catalog": []}
+
+        async def fake_get_json(budget, url, params=None):
+            sent["storesearch"].append(params["term"])
+            return {"items": []}
+
+        def fake_search_catalog(query, limit):
+            sent["catalog"].append(query)
+            return None
+
+        monkeypatch.setattr(service, "_get_json", fake_get_json)
+        monkeypatch.setattr(service.steam, "_search_catalog", fake_search_catalog)
+        service.cache.clear()
+
+        asyncio.run(service.search_games("ガンダム C++"))
+
+        assert sent == {"storesearch": ["ガンダム C++"], "catalog": ["ガンダム C++"]}
+        assert service.cache.get_entry("search_カンタム c") is not None
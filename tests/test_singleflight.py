@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+CALLERS = 8
+
+
+class CountingFlight(SingleFlight):
+    """Counts callers that have joined the table, so a test can hold the leader until all of them have"""
+
+    def __init__(self):
+        super().__init__()
+        self.joined = threading.Semaphore(0)
+
+    def _join(self, key):
+        joined = super()._join(key)
+        self.joined.release()
+        return joined
+
+    def wait_for_callers(self, count):
+        for _ in range(count):
+            assert self.joined.acquire(timeout=5)
+
+
+def test_concurrent_threads_share_one_call():
+    flight = CountingFlight()
+    calls = []
+
+    def load():
+        calls.append(1)
+        # Every caller has joined before the leader's load returns
+        flight.wait_for_callers(CALLERS)
+        return {"ids": [1, 2, 3]}
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(flight.do, "top_game_ids", load) for _ in range(CALLERS)]
+        results = [future.result(5) for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight._calls == {}
+
+
+def test_thread_error_reaches_every_waiter_and_clears_the_key():
+    flight = CountingFlight()
+    calls = []
+
+    def load():
+        calls.append(1)
+        flight.wait_for_callers(CALLERS)
+        raise RuntimeError("upstream down")
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(flight.do, "10", load) for _ in range(CALLERS)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="upstream down"):
+                future.result(5)
+
+    assert len(calls) == 1
+    assert flight._calls == {}
+    assert flight.do("10", lambda: "recovered") == "recovered"
+
+
+def test_concurrent_coroutines_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [1, 2, 3]
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("top_game_ids", load) for _ in range(CALLERS)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert results == [[1, 2, 3]] * CALLERS
+    assert flight._calls == {}
+
+
+def test_coroutine_error_reaches_every_waiter_and_clears_the_key():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do_async("10", load) for _ in range(CALLERS)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight._calls == {}
+
+
+def test_thread_joins_a_coroutine_call_in_flight():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "shared"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async("10", load))
+        await asyncio.sleep(0)
+        follower = await asyncio.to_thread(flight.do, "10", lambda: "own call")
+        return await leader, follower
+
+    assert asyncio.run(run()) == ("shared", "shared")
+    assert len(calls) == 1
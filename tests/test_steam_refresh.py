@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from app.repositories.game_repository import GameRepository
+from app.services.steam_service import GameRecord, SteamService
+from app.utils.cache import MemoryCache
+
+APP_ID = 4242
+
+
+def appdetails(name):
+    return {str(APP_ID): {"success": True, "data": {
+        "steam_appid": APP_ID, "name": name, "is_free": False, "short_description": "Refetched.",
+        "price_overview": {"final": 999}, "release_date": {"date": "1 Jan, 2020"},
+    }}}
+
+
+def wait_for_refresh(key, timeout=5):
+    deadline = time.monotonic() + timeout
+    while key in SteamService._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def steam(app, monkeypatch):
+    monkeypatch.setitem(app.extensions, "steam_cache", MemoryCache())
+    with app.app_context():
+        service = SteamService()
+        # The catalog row is fresh for STEAM_CATALOG_TTL, long after the cache entry's soft TTL
+        GameRepository.upsert_steam_game(service._format_game_data(appdetails("Catalog copy")[str(APP_ID)]["data"]))
+        yield service
+
+
+def test_entry_past_its_soft_ttl_is_refetched_upstream(steam, monkeypatch):
+    fetched = []
+
+    def get_json(budget, url, params=None):
+        fetched.append(params)
+        return appdetails("Upstream copy")
+
+    monkeypatch.setattr(steam, "_get_json", get_json)
+    stale = GameRecord(APP_ID, "Stale copy", "9.99", 2020, "Available", "Action", "", "Windows", None, None)
+    steam.cache.set(str(APP_ID), stale, 3600, 0)
+
+    assert steam.get_game_record(APP_ID).title == "Stale copy"
+    wait_for_refresh(str(APP_ID))
+
+    assert fetched == [{"appids": APP_ID, "l": "english"}]
+    assert steam.cache.get(str(APP_ID)).title == "Upstream copy"
+
+
+def test_stale_entries_in_a_batch_are_refetched_upstream(steam, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(steam, "_get_json", lambda budget, url, params=None: fetched.append(params) or appdetails("Upstream copy"))
+    stale = GameRecord(APP_ID, "Stale copy", "9.99", 2020, "Available", "Action", "", "Windows", None, None)
+    steam.cache.set(str(APP_ID), stale, 3600, 0)
+
+    assert [r.title for r in steam.get_many_game_records([APP_ID])] == ["Stale copy"]
+    wait_for_refresh(str(APP_ID))
+
+    assert fetched == [{"appids": APP_ID, "l": "english"}]
+    assert steam.cache.get(str(APP_ID)).title == "Upstream copy"
+
+
+def test_cold_miss_is_answered_from_a_fresh_catalog_row(steam, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(steam, "_get_json", lambda budget, url, params=None: fetched.append(params))
+
+    assert steam.get_game_record(APP_ID).title == "Catalog copy"
+    assert fetched == []